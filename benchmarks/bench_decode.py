@@ -0,0 +1,110 @@
+"""Micro-benchmark of decoding a poll cycle with and without decode tables.
+
+Decodes one cycle of synthetic register values for every entity in
+ENTITY_DEFINITIONS, once through the per-entity _process_raw_value path and
+once through the precompiled decode tables, checks that both agree on random
+and boundary register values and prints the time per cycle.
+
+    python benchmarks/bench_decode.py
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import random
+import sys
+import timeit
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.froeling_lambdatronic_modbus.block_planner import (  # noqa: E402
+    BIT_TYPES,
+    group_registers,
+)
+from custom_components.froeling_lambdatronic_modbus.coordinator import (  # noqa: E402
+    FroelingDataUpdateCoordinator,
+)
+from custom_components.froeling_lambdatronic_modbus.decoding import (  # noqa: E402
+    decode_block,
+)
+from custom_components.froeling_lambdatronic_modbus.entity_definitions import (  # noqa: E402
+    ENTITY_DEFINITIONS,
+)
+
+ROUNDS = 2000
+
+
+def main() -> None:
+    """Run the benchmark."""
+    coordinator = FroelingDataUpdateCoordinator.__new__(FroelingDataUpdateCoordinator)
+    coordinator._entity_definitions = {
+        entity_id: definition
+        for definitions in ENTITY_DEFINITIONS.values()
+        for entity_id, definition in definitions.items()
+    }
+    coordinator.translations = {}
+
+    rng = random.Random(0)
+    blocks = group_registers(coordinator._entity_definitions)
+    responses = [
+        [rng.random() < 0.5 for _ in range(count)]
+        if block_type in BIT_TYPES
+        else [rng.randrange(65536) for _ in range(count)]
+        for block_type, _start, count, _entities in blocks
+    ]
+    tables = [coordinator._compile_block(block) for block in blocks]
+
+    def per_entity() -> dict:
+        data = {}
+        for (block_type, start_addr, _count, entities), values in zip(
+            blocks, responses
+        ):
+            for entity_id in entities:
+                definition = coordinator._entity_definitions[entity_id]
+                reg_addr = definition.get(
+                    "register",
+                    definition.get("coil", definition.get("discrete_input")),
+                )
+                offset = reg_addr - start_addr
+                if block_type in BIT_TYPES:
+                    data[entity_id] = values[offset]
+                elif definition.get("type") == "binary_sensor_from_register":
+                    data[entity_id] = (
+                        coordinator._process_raw_value(values[offset], definition) > 0
+                    )
+                else:
+                    data[entity_id] = coordinator._process_raw_value(
+                        values[offset], definition
+                    )
+        return data
+
+    def compiled() -> dict:
+        data = {}
+        for table, values in zip(tables, responses):
+            decode_block(values, table, data)
+        return data
+
+    for _ in range(200):
+        for values in responses:
+            if not values or isinstance(values[0], bool):
+                continue
+            values[:] = [
+                rng.choice((0, 32767, 32768, 65535, rng.randrange(65536)))
+                for _ in values
+            ]
+        if per_entity() != compiled():
+            sys.exit("Decode tables disagree with _process_raw_value")
+
+    entities = sum(len(block[3]) for block in blocks)
+    print(f"{len(blocks)} blocks, {entities} entities, {ROUNDS} cycles")
+    timings = {
+        name: min(timeit.repeat(func, number=ROUNDS, repeat=5)) / ROUNDS
+        for name, func in (("per entity", per_entity), ("decode tables", compiled))
+    }
+    baseline = timings["per entity"]
+    for name, seconds in timings.items():
+        print(f"{name:>14}: {seconds * 1e6:8.1f} us/cycle  {baseline / seconds:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Modbus TCP server replaying a recorded bus session.
+
+Answers from a recording made with the record_traffic option: a request
+that was recorded gets the recorded answers in order (starting over when
+they run out), after the recorded duration, and requests that went
+unanswered or got an exception response do so again. Requests that were
+never recorded, e.g. blocks of a changed read plan, are answered from the
+last recorded value of every address, after the mean recorded duration of
+their function code, or rejected with an illegal data address exception if
+an address was never read. A recording holds one session per setup of the
+config entry; the last one is replayed unless --session picks another
+(0 is the first, -2 the one before the last).
+
+    python benchmarks/replay.py froeling_lambdatronic_modbus_traffic_<id>.jsonl
+
+    async with ReplayServer(path) as server:
+        controller = ModbusController(hass, server.host, server.port)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import defaultdict
+import json
+import logging
+from pathlib import Path
+import sys
+from typing import Any
+
+from pymodbus.constants import ExcCodes
+from pymodbus.datastore import ModbusServerContext
+from pymodbus.exceptions import NoSuchIdException
+from pymodbus.server import ModbusTcpServer
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from simulator import FUNCTION_CODE_TYPES, WRITE_FUNCTION_CODES  # noqa: E402
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Recording:
+    """Recorded answers by request and the last value of every address."""
+
+    def __init__(self, entries: list[dict[str, Any]]) -> None:
+        """Init."""
+        self.answers: dict[tuple[int, int, int], list[dict[str, Any]]] = (
+            defaultdict(list)
+        )
+        self.values: dict[str, dict[int, int]] = defaultdict(dict)
+        durations: dict[int, list[float]] = defaultdict(list)
+
+        for entry in entries:
+            function_code = entry["fc"]
+            address = entry["address"]
+            self.answers[(function_code, address, entry["count"])].append(entry)
+            durations[function_code].append(entry["duration"])
+
+            reg_type = FUNCTION_CODE_TYPES[function_code][0]
+            for values in (entry.get("values"), entry.get("response")):
+                if values and "error" not in entry and "exception" not in entry:
+                    self.values[reg_type].update(
+                        zip(range(address, address + len(values)), values)
+                    )
+
+        self.mean_durations = {
+            function_code: sum(values) / len(values)
+            for function_code, values in durations.items()
+        }
+        self._next: dict[tuple[int, int, int], int] = defaultdict(int)
+
+    @classmethod
+    def load(cls, path: Path, session: int = -1) -> Recording:
+        """Load a session of a JSON lines recording."""
+        sessions: list[list[dict[str, Any]]] = []
+        with path.open(encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if "session" in entry or not sessions:
+                    sessions.append([])
+                if "session" not in entry:
+                    sessions[-1].append(entry)
+        if not sessions:
+            return cls([])
+        return cls(sessions[session])
+
+    def next_answer(
+        self, function_code: int, address: int, count: int
+    ) -> dict[str, Any] | None:
+        """Return the next recorded answer to a request, if it was recorded."""
+        key = (function_code, address, count)
+        answers = self.answers.get(key)
+        if not answers:
+            return None
+        index = self._next[key]
+        self._next[key] = (index + 1) % len(answers)
+        return answers[index]
+
+
+class ReplayContext(ModbusServerContext):
+    """Server datastore answering from a recording."""
+
+    def __init__(self, server: ReplayServer) -> None:
+        """Init."""
+        # See SimulatorContext: the server only needs the datastore methods.
+        self.old_simulator = True
+        self.simdevices = []
+        self._server = server
+
+    async def _async_answer(
+        self, function_code: int, address: int, count: int
+    ) -> dict[str, Any] | None:
+        """Wait like the recorded answer and return it, or raise if it was lost."""
+        server = self._server
+        answer = server.recording.next_answer(function_code, address, count)
+        if answer is None:
+            duration = server.recording.mean_durations.get(function_code, 0.0)
+        else:
+            duration = answer["duration"]
+        await asyncio.sleep(duration / server.speed)
+        server.requests.append((function_code, address, count))
+        if answer is not None and "error" in answer:
+            raise NoSuchIdException("not answered in the recording")
+        return answer
+
+    async def async_getValues(
+        self, device_id: int, func_code: int, address: int, count: int = 1
+    ) -> list[int] | list[bool] | ExcCodes:
+        """Return the recorded answer to a read."""
+        answer = None
+        if func_code not in WRITE_FUNCTION_CODES:
+            answer = await self._async_answer(func_code, address, count)
+            if answer is not None and "exception" in answer:
+                return ExcCodes(answer["exception"])
+            if answer is not None and "response" in answer:
+                values = answer["response"]
+                return [bool(v) for v in values] if func_code in (1, 2) else values
+
+        reg_type = FUNCTION_CODE_TYPES[func_code][0]
+        known = self._server.recording.values[reg_type]
+        addresses = range(address, address + count)
+        if not all(addr in known for addr in addresses):
+            return ExcCodes.ILLEGAL_ADDRESS
+        if reg_type in ("coil", "discrete_input"):
+            return [bool(known[addr]) for addr in addresses]
+        return [known[addr] for addr in addresses]
+
+    async def async_setValues(
+        self,
+        device_id: int,
+        func_code: int,
+        address: int,
+        values: list[int] | list[bool],
+    ) -> ExcCodes | None:
+        """Answer a write like the recording and remember the values."""
+        if func_code in WRITE_FUNCTION_CODES:
+            answer = await self._async_answer(func_code, address, len(values))
+            if answer is not None and "exception" in answer:
+                return ExcCodes(answer["exception"])
+
+        reg_type = FUNCTION_CODE_TYPES[func_code][0]
+        self._server.recording.values[reg_type].update(
+            zip(range(address, address + len(values)), map(int, values))
+        )
+        return None
+
+    def device_ids(self) -> list[int]:
+        """Return the served device ids."""
+        return [0]
+
+
+class ReplayServer:
+    """Modbus TCP server answering from a recording.
+
+    speed scales time: 2 answers twice as fast as recorded. requests records
+    (function code, protocol address, count) of every request served.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        speed: float = 1.0,
+        session: int = -1,
+    ) -> None:
+        """Init. Port 0 picks a free port."""
+        self.recording = Recording.load(path, session)
+        self.host = host
+        self.port = port
+        self.speed = speed
+        self.requests: list[tuple[int, int, int]] = []
+        self._server: ModbusTcpServer | None = None
+
+    async def async_start(self) -> None:
+        """Start serving."""
+        self._server = ModbusTcpServer(
+            ReplayContext(self),
+            address=(self.host, self.port),
+            ignore_missing_devices=True,
+        )
+        await self._server.serve_forever(background=True)
+        self.port = self._server.transport.sockets[0].getsockname()[1]
+        _LOGGER.info("Replay server listening on %s:%s", self.host, self.port)
+
+    async def async_stop(self) -> None:
+        """Stop serving."""
+        if self._server is not None:
+            await self._server.shutdown()
+            self._server = None
+
+    async def __aenter__(self) -> ReplayServer:
+        """Start serving in an async with block."""
+        await self.async_start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Stop serving at the end of an async with block."""
+        await self.async_stop()
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    """Serve until interrupted."""
+    async with ReplayServer(
+        args.recording, args.host, args.port, args.speed, args.session
+    ) as server:
+        print(f"Replaying on {server.host}:{server.port}, Ctrl+C to stop")
+        await asyncio.Event().wait()
+
+
+def main() -> None:
+    """Run the replay server from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("recording", type=Path)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--session", type=int, default=-1)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_async_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""Benchmarks of the polling hot path against the Lambdatronic simulator.
+
+Runs the block planner, per-entity decoding, a full update cycle with every
+category enabled, refreshing entities after writes and the config flow
+preview against benchmarks/simulator.py, and reports per benchmark the wall
+time, the Modbus requests sent and the registers (or coils) transferred.
+Results are written as JSON; with --compare the run fails if a benchmark
+sends more requests or transfers more registers than the baseline, or got
+slower by more than the tolerance. --framer rtu runs the same benchmarks
+with RTU frames over TCP, as with a bridge in transparent mode, and
+--transport serial with Modbus RTU over a pseudo-terminal pair (Linux), as
+with the boiler on a local serial port. --pipeline-depth sends up to that
+many requests at once to a simulated bridge queueing them. --overrun-gap
+simulates a bridge losing requests that follow an answer too closely, to
+compare --min-frame-gap and --auto-tune-gap.
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --compare results.json
+    python benchmarks/run_benchmarks.py --framer rtu --compare results.json
+    python benchmarks/run_benchmarks.py --transport serial --compare results.json
+    python benchmarks/run_benchmarks.py --pipeline-depth 4 --compare results.json
+    python benchmarks/run_benchmarks.py --overrun-gap 0.015 --auto-tune-gap
+
+Needs Home Assistant installed, like the integration itself.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+import json
+from pathlib import Path
+import platform
+import random
+import sys
+import tempfile
+import time
+import timeit
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from custom_components.froeling_lambdatronic_modbus import (  # noqa: E402
+    config_flow,
+)
+from custom_components.froeling_lambdatronic_modbus.const import (  # noqa: E402
+    DEFAULT_REGISTER_COST,
+    DEFAULT_REQUEST_OVERHEAD,
+)
+from custom_components.froeling_lambdatronic_modbus.coordinator import (  # noqa: E402
+    FroelingDataUpdateCoordinator,
+)
+from custom_components.froeling_lambdatronic_modbus.entity_definitions import (  # noqa: E402
+    ENTITY_DEFINITIONS,
+)
+from custom_components.froeling_lambdatronic_modbus.modbus_controller import (  # noqa: E402
+    ModbusController,
+)
+from simulator import LambdatronicSimulator, SerialLink  # noqa: E402
+
+CPU_ROUNDS = 200
+BUS_ROUNDS = 5
+REFRESHED_NUMBERS = 5
+
+
+class BenchmarkEntry:
+    """Stand-in for the config entry; the coordinator only needs its id."""
+
+    entry_id = "benchmark"
+    domain = "froeling_lambdatronic_modbus"
+
+    def async_on_unload(self, func: Callable[[], Any]) -> None:
+        """Ignore unload callbacks."""
+
+
+class BenchmarkFlow:
+    """Stand-in for the config flow driving the preview."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Init."""
+        self.hass = hass
+
+    def async_update_progress(self, progress: float) -> None:
+        """Ignore progress updates."""
+
+
+async def _async_no_translations(*args: Any, **kwargs: Any) -> dict[str, str]:
+    """Return no translations, so the preview doesn't load the integration."""
+    return {}
+
+
+def _result(
+    wall_times: list[float], requests: int, registers: int, rounds: int
+) -> dict[str, Any]:
+    """Summarize the rounds of a benchmark."""
+    return {
+        "wall_time": min(wall_times),
+        "mean_wall_time": sum(wall_times) / len(wall_times),
+        "rounds": len(wall_times),
+        "requests": requests // rounds,
+        "registers": registers // rounds,
+    }
+
+
+async def _async_measure_bus(
+    simulator: LambdatronicSimulator,
+    func: Callable[[], Awaitable[Any]],
+    rounds: int = BUS_ROUNDS,
+) -> dict[str, Any]:
+    """Time an async benchmark and count the requests it sent."""
+    wall_times = []
+    first_request = len(simulator.requests)
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await func()
+        wall_times.append(time.perf_counter() - started)
+    requests = simulator.requests[first_request:]
+    return _result(
+        wall_times, len(requests), sum(count for _fc, _addr, count in requests), rounds
+    )
+
+
+def _measure_cpu(func: Callable[[], Any], rounds: int = CPU_ROUNDS) -> dict[str, Any]:
+    """Time a benchmark that doesn't touch the bus."""
+    wall_times = [
+        seconds / rounds for seconds in timeit.repeat(func, number=rounds, repeat=5)
+    ]
+    return _result(wall_times, 0, 0, 1)
+
+
+async def async_run(
+    link: SerialLink | None,
+    framer: str = "socket",
+    transport: str = "tcp",
+    pipeline_depth: int = 1,
+    min_frame_gap: float = 0.0,
+    frame_gap_auto_tune: bool = False,
+) -> dict[str, dict[str, Any]]:
+    """Run all benchmarks and return their results by name."""
+    results: dict[str, dict[str, Any]] = {}
+
+    async with LambdatronicSimulator(
+        link=link,
+        framer=framer,
+        serial=transport == "serial",
+        pipelining=pipeline_depth > 1,
+    ) as simulator:
+        host = simulator.serial_port or simulator.host
+        with tempfile.TemporaryDirectory() as config_dir:
+            hass = HomeAssistant(config_dir)
+            config = {
+                "name": "Froeling",
+                "host": host,
+                "port": simulator.port,
+                "update_interval": 60,
+                # Fixed cost model, so every round reads the same blocks.
+                "request_overhead_ms": DEFAULT_REQUEST_OVERHEAD * 1000,
+                "register_cost_ms": DEFAULT_REGISTER_COST * 1000,
+                "entities": {
+                    category: list(definitions)
+                    for category, definitions in ENTITY_DEFINITIONS.items()
+                },
+            }
+            # No debounce, so write benchmarks measure the bus and not the delay.
+            controller = ModbusController(
+                hass,
+                host,
+                simulator.port,
+                write_delay=0,
+                framer=framer,
+                baudrate=link.baudrate if link else 9600,
+                transport=transport,
+                pipeline_depth=pipeline_depth,
+                frame_gap_preset="custom",
+                min_frame_gap=min_frame_gap,
+                frame_gap_auto_tune=frame_gap_auto_tune,
+            )
+            coordinator = FroelingDataUpdateCoordinator(
+                hass, controller=controller, config=config, config_entry=BenchmarkEntry()
+            )
+            coordinator.translations = {}
+
+            results["group_registers"] = _measure_cpu(coordinator._group_registers)
+
+            rng = random.Random(0)
+            register_definitions = [
+                definition
+                for definition in coordinator._entity_definitions.values()
+                if "register" in definition
+            ]
+            raw_values = [rng.randrange(65536) for _ in register_definitions]
+
+            def process_raw_values() -> None:
+                for raw_value, definition in zip(raw_values, register_definitions):
+                    coordinator._process_raw_value(raw_value, definition)
+
+            results["process_raw_value"] = _measure_cpu(process_raw_values)
+
+            async def update_cycle() -> None:
+                # Without data every tier is due, as in the first refresh.
+                coordinator.data = None
+                coordinator.data = await coordinator._async_update_data()
+
+            results["update_cycle"] = await _async_measure_bus(simulator, update_cycle)
+
+            numbers = [
+                entity_id
+                for entity_id, definition in coordinator._entity_definitions.items()
+                if definition.get("type") == "number"
+            ][:REFRESHED_NUMBERS]
+
+            async def refresh_after_write() -> None:
+                for entity_id in numbers:
+                    definition = coordinator._entity_definitions[entity_id]
+                    raw_value = round(definition["min"] * definition.get("scaling", 1))
+                    # The read back of the write refreshes the entity.
+                    await coordinator.async_write_entity(entity_id, raw_value)
+
+            results["refresh_after_write"] = await _async_measure_bus(
+                simulator, refresh_after_write
+            )
+
+            flow = BenchmarkFlow(hass)
+            preview_config = {
+                "host": host,
+                "port": simulator.port,
+                "transport": transport,
+                "categories": list(ENTITY_DEFINITIONS),
+            }
+
+            async def config_flow_preview() -> None:
+                with patch.object(
+                    config_flow, "async_get_translations", _async_no_translations
+                ):
+                    await config_flow._async_read_preview_options(flow, preview_config)
+
+            results["config_flow_preview"] = await _async_measure_bus(
+                simulator, config_flow_preview
+            )
+
+            await controller.async_close()
+            await hass.async_stop(force=True)
+
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    tolerance: float,
+) -> list[str]:
+    """Return the regressions of results against a baseline."""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for counter in ("requests", "registers"):
+            if result[counter] > previous[counter]:
+                regressions.append(
+                    f"{name}: {counter} {previous[counter]} -> {result[counter]}"
+                )
+        if result["wall_time"] > previous["wall_time"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: wall time {previous['wall_time'] * 1000:.2f} ms -> "
+                f"{result['wall_time'] * 1000:.2f} ms"
+            )
+    return regressions
+
+
+def main() -> None:
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    parser.add_argument("--compare", type=Path, help="baseline results to compare")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed relative wall time increase over the baseline",
+    )
+    parser.add_argument(
+        "--no-link",
+        action="store_true",
+        help="answer instantly instead of modelling the 9600 baud link",
+    )
+    parser.add_argument(
+        "--framer",
+        choices=["socket", "rtu"],
+        default="socket",
+        help="Modbus TCP or RTU frames over TCP between controller and simulator",
+    )
+    parser.add_argument(
+        "--transport",
+        choices=["tcp", "serial"],
+        default="tcp",
+        help="talk to the simulator over TCP or a pseudo-terminal pair",
+    )
+    parser.add_argument(
+        "--pipeline-depth",
+        type=int,
+        default=1,
+        help="requests in flight at once (Modbus TCP framing only)",
+    )
+    parser.add_argument(
+        "--overrun-gap",
+        type=float,
+        default=0.0,
+        help="simulate a bridge losing requests sooner after an answer (seconds)",
+    )
+    parser.add_argument(
+        "--min-frame-gap",
+        type=float,
+        default=0.0,
+        help="pause between an answer and the next request (seconds)",
+    )
+    parser.add_argument(
+        "--auto-tune-gap", action="store_true", help="tune the pause automatically"
+    )
+    args = parser.parse_args()
+
+    link = None
+    if not args.no_link:
+        # No bridge between a local serial port and the boiler.
+        link = SerialLink(
+            gateway_latency=0.0 if args.transport == "serial" else 0.005,
+            overrun_gap=args.overrun_gap,
+        )
+    results = asyncio.run(
+        async_run(
+            link,
+            args.framer,
+            args.transport,
+            args.pipeline_depth,
+            args.min_frame_gap,
+            args.auto_tune_gap,
+        )
+    )
+
+    for name, result in results.items():
+        print(
+            f"{name:>20}: {result['wall_time'] * 1000:10.3f} ms"
+            f"  {result['requests']:4d} requests  {result['registers']:5d} registers"
+        )
+
+    if args.output:
+        args.output.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "serial_link": link is not None,
+                    "framer": args.framer,
+                    "transport": args.transport,
+                    "pipeline_depth": args.pipeline_depth,
+                    "overrun_gap": args.overrun_gap,
+                    "min_frame_gap": args.min_frame_gap,
+                    "frame_gap_auto_tune": args.auto_tune_gap,
+                    "benchmarks": results,
+                },
+                indent=2,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if baseline["serial_link"] != (link is not None):
+            sys.exit("Baseline was run with a different link model")
+        regressions = compare(results, baseline["benchmarks"], args.tolerance)
+        if regressions:
+            sys.exit("Regressions:\n" + "\n".join(regressions))
+        print("No regressions against", args.compare)
+
+
+if __name__ == "__main__":
+    main()
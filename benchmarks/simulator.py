@@ -0,0 +1,551 @@
+"""Lambdatronic Modbus simulator for offline testing and benchmarks.
+
+Serves every address in ENTITY_DEFINITIONS with a plausible value on a local
+pymodbus TCP server. Optionally models the RS232 link behind a serial bridge:
+the time frames take on the wire at 9600 baud, device and gateway latency,
+addresses the device rejects with an illegal data address exception and
+dropped frames, which the client sees as timeouts.
+
+From a script or test:
+
+    async with LambdatronicSimulator(link=SerialLink()) as simulator:
+        controller = ModbusController(hass, simulator.host, simulator.port)
+
+With serial=True it serves Modbus RTU on one end of a pseudo-terminal pair
+instead (Linux), for the serial transport on the other end:
+
+    async with LambdatronicSimulator(link=SerialLink(), serial=True) as simulator:
+        controller = ModbusController(
+            hass, simulator.serial_port, 0, transport="serial"
+        )
+
+Standalone, for pointing a Home Assistant instance at it:
+
+    python benchmarks/simulator.py --port 5020 --serial-link --drop-rate 0.01
+    python benchmarks/simulator.py --serial --serial-link
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+import random
+import sys
+import time
+import tty
+from typing import Any
+
+from pymodbus import FramerType
+from pymodbus.constants import ExcCodes
+from pymodbus.datastore import ModbusServerContext
+from pymodbus.exceptions import NoSuchIdException
+from pymodbus.framer import FramerSocket
+from pymodbus.pdu import DecodePDU, ModbusPDU
+from pymodbus.server import ModbusSerialServer, ModbusTcpServer
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.froeling_lambdatronic_modbus.block_planner import (  # noqa: E402
+    get_register_type,
+)
+from custom_components.froeling_lambdatronic_modbus.entity_definitions import (  # noqa: E402
+    ENTITY_DEFINITIONS,
+)
+from custom_components.froeling_lambdatronic_modbus.telemetry import (  # noqa: E402
+    RTU_FRAME_OVERHEAD,
+    pdu_sizes,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+TRANSLATIONS = (
+    Path(__file__).resolve().parents[1]
+    / "custom_components"
+    / "froeling_lambdatronic_modbus"
+    / "translations"
+    / "en.json"
+)
+
+# Register type and Lambdatronic address offset per function code.
+FUNCTION_CODE_TYPES = {
+    1: ("coil", 0),
+    5: ("coil", 0),
+    15: ("coil", 0),
+    2: ("discrete_input", 10001),
+    4: ("input", 30001),
+    3: ("holding", 40001),
+    6: ("holding", 40001),
+    16: ("holding", 40001),
+    23: ("holding", 40001),
+}
+WRITE_FUNCTION_CODES = (5, 6, 15, 16)
+
+# Plausible engineering values per unit: (low, high).
+UNIT_RANGES = {
+    "°C": (20, 85),
+    "%": (0, 100),
+    "h": (0, 20000),
+    "min": (0, 600),
+    "s": (0, 600),
+    "kWh": (0, 60000),
+    "kW": (0, 30),
+    "t": (0, 20),
+    "kg": (0, 500),
+    "upm": (0, 2500),
+    "L/h": (0, 1500),
+}
+
+
+class SerialLink:
+    """Timing model of the RS232 link between the bridge and the boiler.
+
+    A request costs the gateway latency, the request frame on the wire, the
+    device latency and the response frame on the wire. Frames are followed by
+    the 3.5 character silent interval of Modbus RTU. The link carries one
+    frame at a time, so concurrent requests queue for the wire time; the
+    gateway latency of queued requests overlaps. A bridge whose serial buffer
+    overruns loses requests arriving less than overrun_gap after its last
+    answer.
+    """
+
+    def __init__(
+        self,
+        baudrate: int = 9600,
+        bits_per_char: int = 10,
+        device_latency: float = 0.02,
+        gateway_latency: float = 0.005,
+        drop_rate: float = 0.0,
+        overrun_gap: float = 0.0,
+    ) -> None:
+        """Init."""
+        self.baudrate = baudrate
+        self.bits_per_char = bits_per_char
+        self.device_latency = device_latency
+        self.gateway_latency = gateway_latency
+        self.drop_rate = drop_rate
+        self.overrun_gap = overrun_gap
+
+    def frame_time(self, size: int) -> float:
+        """Return the seconds a PDU of the given size occupies the wire."""
+        return (
+            (size + RTU_FRAME_OVERHEAD + 3.5) * self.bits_per_char / self.baudrate
+        )
+
+    def wire_time(self, function_code: int, count: int) -> float:
+        """Return the seconds a request and its answer occupy the link."""
+        request_size, response_size = pdu_sizes(function_code, count)
+        return (
+            self.frame_time(request_size)
+            + self.device_latency
+            + self.frame_time(response_size)
+        )
+
+
+def realistic_value(
+    definition: dict[str, Any], rng: random.Random, states: dict[str, dict]
+) -> int:
+    """Return a plausible raw register value for an entity definition."""
+    entity_type = definition.get("type")
+    reg_type, _address = get_register_type(definition)
+    if reg_type in ("coil", "discrete_input") or entity_type in (
+        "binary_sensor",
+        "binary_sensor_from_register",
+    ):
+        return int(rng.random() < 0.5)
+    if entity_type == "select":
+        return rng.randrange(len(definition.get("options", [None])))
+    if entity_type == "text":
+        keys = states.get(definition.get("translation_key"), {}).get("state", {})
+        return int(rng.choice(list(keys))) if keys else 0
+
+    scaling = definition.get("scaling", 1) or 1
+    if "min" in definition and "max" in definition:
+        low, high = definition["min"], definition["max"]
+    else:
+        low, high = UNIT_RANGES.get(definition.get("unit"), (0, 100))
+    return round(rng.uniform(low, high) * scaling) & 0xFFFF
+
+
+class PtyPair:
+    """Two pseudo-terminals connected like a null modem cable.
+
+    Bytes written to one of the paths can be read from the other. The masters
+    are relayed on the event loop, so no socat is needed.
+    """
+
+    def __init__(self) -> None:
+        """Init."""
+        self._fds = [os.openpty() for _ in range(2)]
+        for _master, slave in self._fds:
+            tty.setraw(slave)
+        self.paths = [os.ttyname(slave) for _master, slave in self._fds]
+        (self._master_a, _), (self._master_b, _) = self._fds
+
+    def start(self) -> None:
+        """Start relaying between the two terminals."""
+        loop = asyncio.get_running_loop()
+        loop.add_reader(self._master_a, self._relay, self._master_a, self._master_b)
+        loop.add_reader(self._master_b, self._relay, self._master_b, self._master_a)
+
+    @staticmethod
+    def _relay(source: int, target: int) -> None:
+        """Copy what is waiting on one master to the other."""
+        try:
+            os.write(target, os.read(source, 4096))
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        """Stop relaying and close the terminals."""
+        loop = asyncio.get_running_loop()
+        for master, slave in self._fds:
+            loop.remove_reader(master)
+            os.close(master)
+            os.close(slave)
+
+
+class SimulatorContext(ModbusServerContext):
+    """Server datastore answering from a Lambdatronic register map.
+
+    Implements the datastore interface the pymodbus server calls for every
+    request, instead of the device contexts pymodbus ships with, so the link
+    can be modelled per request.
+    """
+
+    def __init__(self, simulator: LambdatronicSimulator) -> None:
+        """Init."""
+        # ModbusServerContext.__init__ expects device contexts; the server
+        # only needs the datastore methods below.
+        self.old_simulator = True
+        self.simdevices = []
+        self._simulator = simulator
+
+    async def async_getValues(
+        self, device_id: int, func_code: int, address: int, count: int = 1
+    ) -> list[int] | list[bool] | ExcCodes:
+        """Return count values starting at a protocol address.
+
+        Writes of a single coil or register read the written value back to
+        echo it; that is part of the write, which async_setValues recorded.
+        """
+        simulator = self._simulator
+        reg_type, offset = FUNCTION_CODE_TYPES[func_code]
+        first = address + offset
+        addresses = range(first, first + count)
+        if func_code not in WRITE_FUNCTION_CODES:
+            await simulator.async_transfer(func_code, count)
+            if not simulator.holes[reg_type].isdisjoint(addresses):
+                return ExcCodes.ILLEGAL_ADDRESS
+            simulator.requests.append((func_code, first, count))
+
+        values = simulator.values[reg_type]
+        if reg_type in ("coil", "discrete_input"):
+            return [bool(values.get(addr, 0)) for addr in addresses]
+        return [values.get(addr, 0) for addr in addresses]
+
+    async def async_setValues(
+        self,
+        device_id: int,
+        func_code: int,
+        address: int,
+        values: list[int] | list[bool],
+    ) -> ExcCodes | None:
+        """Store values starting at a protocol address."""
+        simulator = self._simulator
+        if func_code in WRITE_FUNCTION_CODES:
+            await simulator.async_transfer(func_code, len(values))
+
+        reg_type, offset = FUNCTION_CODE_TYPES[func_code]
+        first = address + offset
+        if not simulator.holes[reg_type].isdisjoint(range(first, first + len(values))):
+            return ExcCodes.ILLEGAL_ADDRESS
+        if func_code != 23:
+            simulator.requests.append((func_code, first, len(values)))
+        simulator.values[reg_type].update(
+            zip(range(first, first + len(values)), map(int, values))
+        )
+        return None
+
+    def device_ids(self) -> list[int]:
+        """Return the served device ids."""
+        return [self._simulator.device_id]
+
+
+class LambdatronicSimulator:
+    """Modbus server impersonating a Lambdatronic behind a serial bridge.
+
+    values holds the raw value of every address per register type, keyed by
+    Lambdatronic address (40001 based for holding registers and so on).
+    requests records (function code, Lambdatronic address, count) of every
+    answered request. Any device id is answered. framer "rtu" serves RTU
+    frames over TCP, like a bridge in transparent mode. serial serves Modbus
+    RTU on a pseudo-terminal instead of TCP; clients open serial_port.
+
+    pymodbus' TCP server handles one request per connection at a time. With
+    pipelining, Modbus TCP is served by a bridge model that queues all
+    requests received and answers them in order instead, for clients with
+    several requests outstanding.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        device_id: int = 2,
+        link: SerialLink | None = None,
+        holes: dict[str, set[int]] | None = None,
+        seed: int = 0,
+        framer: str = "socket",
+        serial: bool = False,
+        pipelining: bool = False,
+    ) -> None:
+        """Init. Port 0 picks a free port."""
+        self.host = host
+        self.framer = framer
+        self.serial = serial
+        self.pipelining = pipelining
+        self._bridge: asyncio.Server | None = None
+        self._bridge_clients: dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self.serial_port: str | None = None
+        self._pty: PtyPair | None = None
+        self.port = port
+        self.device_id = device_id
+        self.link = link
+        self.holes = {
+            reg_type: set((holes or {}).get(reg_type, ()))
+            for reg_type in ("input", "discrete_input", "holding", "coil")
+        }
+        self.requests: list[tuple[int, int, int]] = []
+        self._rng = random.Random(seed)
+        self._last_answer = 0.0
+        self._wire = asyncio.Lock()
+        self._server: ModbusTcpServer | ModbusSerialServer | None = None
+
+        states = json.loads(TRANSLATIONS.read_text(encoding="utf-8"))["entity"][
+            "sensor"
+        ]
+        self.values: dict[str, dict[int, int]] = {
+            reg_type: {} for reg_type in self.holes
+        }
+        for definitions in ENTITY_DEFINITIONS.values():
+            for definition in definitions.values():
+                reg_type, address = get_register_type(definition)
+                if reg_type is not None and address is not None:
+                    self.values[reg_type][address] = realistic_value(
+                        definition, self._rng, states
+                    )
+
+    async def async_transfer(self, function_code: int, count: int) -> None:
+        """Wait for a request to cross the modelled link, or drop it."""
+        if self.link is None:
+            return
+        if time.monotonic() - self._last_answer < self.link.overrun_gap:
+            raise NoSuchIdException("bridge buffer overrun")
+        await asyncio.sleep(self.link.gateway_latency)
+        async with self._wire:
+            await asyncio.sleep(self.link.wire_time(function_code, count))
+        self._last_answer = time.monotonic()
+        if self._rng.random() < self.link.drop_rate:
+            # Unknown device ids are not answered, so the client times out.
+            raise NoSuchIdException("frame dropped")
+
+    async def async_start(self) -> None:
+        """Start serving."""
+        if self.serial:
+            self._pty = PtyPair()
+            self._pty.start()
+            server_port, self.serial_port = self._pty.paths
+            baudrate = self.link.baudrate if self.link else 9600
+            self._server = ModbusSerialServer(
+                SimulatorContext(self),
+                port=server_port,
+                baudrate=baudrate,
+                ignore_missing_devices=True,
+            )
+            await self._server.serve_forever(background=True)
+            _LOGGER.info("Simulator serving on %s", self.serial_port)
+            return
+
+        if self.pipelining:
+            self._bridge = await asyncio.start_server(
+                self._async_serve_bridge_client, self.host, self.port
+            )
+            self.port = self._bridge.sockets[0].getsockname()[1]
+            _LOGGER.info("Simulator bridge listening on %s:%s", self.host, self.port)
+            return
+
+        self._server = ModbusTcpServer(
+            SimulatorContext(self),
+            address=(self.host, self.port),
+            framer=FramerType(self.framer),
+            ignore_missing_devices=True,
+        )
+        await self._server.serve_forever(background=True)
+        self.port = self._server.transport.sockets[0].getsockname()[1]
+        _LOGGER.info("Simulator listening on %s:%s", self.host, self.port)
+
+    async def _async_serve_bridge_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Queue the requests of a client and answer them in order."""
+        self._bridge_clients[asyncio.current_task()] = writer
+        framer = FramerSocket(DecodePDU(is_server=True))
+        context = SimulatorContext(self)
+        buffer = b""
+        previous: asyncio.Task[None] | None = None
+        try:
+            while data := await reader.read(1024):
+                buffer += data
+                while True:
+                    used, request = framer.handleFrame(buffer, 0, 0)
+                    buffer = buffer[used:]
+                    if request is None:
+                        break
+                    previous = asyncio.create_task(
+                        self._async_bridge_answer(
+                            request, context, framer, writer, previous
+                        )
+                    )
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            del self._bridge_clients[asyncio.current_task()]
+
+    @staticmethod
+    async def _async_bridge_answer(
+        request: ModbusPDU,
+        context: SimulatorContext,
+        framer: FramerSocket,
+        writer: asyncio.StreamWriter,
+        previous: asyncio.Task[None] | None,
+    ) -> None:
+        """Execute a queued request and answer once the previous one was."""
+        try:
+            response = await request.datastore_update(context, request.dev_id)
+        except NoSuchIdException:
+            response = None
+        if previous is not None:
+            await previous
+        if response is not None and not writer.is_closing():
+            response.transaction_id = request.transaction_id
+            response.dev_id = request.dev_id
+            writer.write(framer.buildFrame(response))
+
+    async def async_stop(self) -> None:
+        """Stop serving."""
+        if self._bridge is not None:
+            self._bridge.close()
+            clients = list(self._bridge_clients)
+            for writer in self._bridge_clients.values():
+                writer.close()
+            await asyncio.gather(*clients)
+            await self._bridge.wait_closed()
+            self._bridge = None
+        if self._server is not None:
+            await self._server.shutdown()
+            self._server = None
+        if self._pty is not None:
+            self._pty.close()
+            self._pty = None
+
+    async def __aenter__(self) -> LambdatronicSimulator:
+        """Start serving in an async with block."""
+        await self.async_start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Stop serving at the end of an async with block."""
+        await self.async_stop()
+
+
+def _parse_holes(values: list[str]) -> dict[str, set[int]]:
+    """Parse TYPE:ADDRESS arguments into holes per register type."""
+    holes: dict[str, set[int]] = {}
+    for value in values:
+        reg_type, _sep, address = value.partition(":")
+        holes.setdefault(reg_type, set()).add(int(address))
+    return holes
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    """Serve until interrupted."""
+    link = None
+    if args.serial_link:
+        link = SerialLink(
+            baudrate=args.baudrate,
+            gateway_latency=args.gateway_latency,
+            drop_rate=args.drop_rate,
+            overrun_gap=args.overrun_gap,
+        )
+    simulator = LambdatronicSimulator(
+        args.host,
+        args.port,
+        link=link,
+        holes=_parse_holes(args.hole),
+        framer=args.framer,
+        serial=args.serial,
+        pipelining=args.pipelining,
+    )
+    async with simulator:
+        if simulator.serial_port:
+            print(f"Serving on {simulator.serial_port}, Ctrl+C to stop")
+        else:
+            print(f"Serving on {simulator.host}:{simulator.port}, Ctrl+C to stop")
+        await asyncio.Event().wait()
+
+
+def main() -> None:
+    """Run the simulator from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument(
+        "--serial-link", action="store_true", help="model the RS232 link timing"
+    )
+    parser.add_argument("--baudrate", type=int, default=9600)
+    parser.add_argument("--gateway-latency", type=float, default=0.005)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--overrun-gap",
+        type=float,
+        default=0.0,
+        help="lose requests arriving sooner after the last answer (seconds)",
+    )
+    parser.add_argument(
+        "--framer",
+        choices=["socket", "rtu"],
+        default="socket",
+        help="serve Modbus TCP or RTU frames over TCP",
+    )
+    parser.add_argument(
+        "--serial",
+        action="store_true",
+        help="serve Modbus RTU on a pseudo-terminal instead of TCP (Linux)",
+    )
+    parser.add_argument(
+        "--pipelining",
+        action="store_true",
+        help="queue requests like a bridge accepting several outstanding ones",
+    )
+    parser.add_argument(
+        "--hole",
+        action="append",
+        default=[],
+        metavar="TYPE:ADDRESS",
+        help="reject an address, e.g. input:30050 (repeatable)",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_async_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -10,12 +10,16 @@ from homeassistant import config_entries
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
 
-from .coordinator import FroelingDataUpdateCoordinator
-from .modbus_controller import ModbusController
+from .const import FRAME_GAP_PRESETS
+from .coordinator import HOLES_STORAGE_VERSION, FroelingDataUpdateCoordinator
+from .modbus_controller import ConnectionSettingsMismatch, ModbusController
+from .recorder import BusRecorder
 
 DOMAIN = "froeling_lambdatronic_modbus"
 _LOGGER = logging.getLogger(__name__)
@@ -29,6 +33,26 @@ CONFIG_SCHEMA = vol.Schema(
                 vol.Required("port", default=502): cv.port,
                 vol.Optional("device_id", default=2): cv.positive_int,
                 vol.Required("update_interval", default=60): cv.positive_int,
+                vol.Optional("fast_interval"): cv.positive_int,
+                vol.Optional("slow_interval"): cv.positive_int,
+                vol.Optional("retry_budget"): cv.positive_int,
+                vol.Optional("stale_after"): cv.positive_int,
+                vol.Optional("write_delay"): cv.positive_float,
+                vol.Optional("write_mode"): vol.In(["write_read", "fc23"]),
+                vol.Optional("timeout"): cv.positive_float,
+                vol.Optional("timeout_floor"): cv.positive_float,
+                vol.Optional("record_traffic"): cv.boolean,
+                vol.Optional("framer"): vol.In(["socket", "rtu"]),
+                vol.Optional("baudrate"): cv.positive_int,
+                vol.Optional("transport"): vol.In(["tcp", "serial"]),
+                vol.Optional("parity"): vol.In(["N", "E", "O"]),
+                vol.Optional("inter_char_timeout"): cv.positive_float,
+                vol.Optional("pipeline_depth"): cv.positive_int,
+                vol.Optional("frame_gap_preset"): vol.In(
+                    [*FRAME_GAP_PRESETS, "custom"]
+                ),
+                vol.Optional("min_frame_gap"): cv.positive_float,
+                vol.Optional("frame_gap_auto_tune"): cv.boolean,
                 vol.Optional("kessel", default=True): cv.boolean,
                 vol.Optional("fehlerpuffer", default=True): cv.boolean,
                 vol.Optional("boiler01", default=True): cv.boolean,
@@ -129,20 +153,52 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     config = {**entry.data, **entry.options}
 
-    controller = ModbusController(
-        hass,
-        config.get("host", ""),
-        config.get("port", 502),
-        device_id=config.get("device_id", 2),
-        timeout=config.get("timeout", 10),
-        retries=config.get("retries", 1),
-        reconnect_delay=config.get("reconnect_delay", 30),
-    )
+    recorder = None
+    if config.get("record_traffic"):
+        recorder = BusRecorder(
+            hass, hass.config.path(f"{DOMAIN}_traffic_{entry.entry_id}.jsonl")
+        )
+
+    try:
+        controller = ModbusController(
+            hass,
+            config.get("host", ""),
+            config.get("port", 502),
+            device_id=config.get("device_id", 2),
+            timeout=config.get("timeout", 10),
+            timeout_floor=config.get("timeout_floor", 0.3),
+            retries=config.get("retries", 1),
+            reconnect_delay=config.get("reconnect_delay", 30),
+            write_delay=config.get("write_delay", 0.5),
+            write_mode=config.get("write_mode", "write_read"),
+            recorder=recorder,
+            framer=config.get("framer", "socket"),
+            baudrate=config.get("baudrate", 9600),
+            transport=config.get("transport", "tcp"),
+            parity=config.get("parity", "N"),
+            inter_char_timeout=config.get("inter_char_timeout", 0.05),
+            pipeline_depth=config.get("pipeline_depth", 1),
+            frame_gap_preset=config.get("frame_gap_preset", "none"),
+            min_frame_gap=config.get("min_frame_gap", 0.0),
+            frame_gap_auto_tune=config.get("frame_gap_auto_tune", False),
+        )
+    except ConnectionSettingsMismatch as err:
+        # Retried, as the other entries may still be reloading with the same
+        # new settings.
+        if recorder is not None:
+            await recorder.async_close()
+        raise ConfigEntryNotReady(err) from err
     coordinator = FroelingDataUpdateCoordinator(
         hass, controller=controller, config=config, config_entry=entry
     )
 
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except BaseException:
+        # Release the shared connection, so a retry or changed settings can
+        # open it again.
+        await controller.async_close()
+        raise
 
     hass.data[DOMAIN][entry.entry_id] = {
         "config": config,
@@ -164,3 +220,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             coordinator: FroelingDataUpdateCoordinator = entry_data["coordinator"]
             await coordinator.controller.async_close()
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored data of a config entry."""
+    await Store(
+        hass, HOLES_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.holes"
+    ).async_remove()
@@ -5,11 +5,10 @@ from typing import Any
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import FroelingDataUpdateCoordinator
+from .entity import FroelingEntity
 from .entity_definitions import ENTITY_DEFINITIONS
 
 _LOGGER = logging.getLogger(__name__)
@@ -40,9 +39,7 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
     async_add_entities(binary_sensors)
 
 
-class FroelingBinarySensor(
-    CoordinatorEntity[FroelingDataUpdateCoordinator], BinarySensorEntity
-):
+class FroelingBinarySensor(FroelingEntity, BinarySensorEntity):
     """A binary sensor that fetches data from the coordinator."""
 
     def __init__(
@@ -52,14 +49,7 @@ class FroelingBinarySensor(
         entity_id: str,
     ):
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
-        self._entity_id = entity_id
-        self._device_name = config["name"]
-        self.entity_definition = coordinator._entity_definitions[entity_id]
-
-        self._attr_unique_id = f"{self._device_name}_{self._entity_id}"
-        self._attr_has_entity_name = True
-        self._attr_translation_key = self._entity_id
+        super().__init__(coordinator, config, entity_id)
         self._attr_device_class = self.entity_definition.get("device_class")
 
     @property
@@ -70,14 +60,3 @@ class FroelingBinarySensor(
     @property
     def device_class(self):
         return self.entity_definition.get("device_class")
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return the device info."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._device_name)},
-            name=self._device_name,
-            manufacturer="Froeling",
-            model="Lambdatronic Modbus",
-            sw_version="1.0",
-        )
@@ -0,0 +1,210 @@
+"""Read block planner for the Fröling Lambdatronic Modbus integration."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterable
+from typing import Any
+
+from .const import DEFAULT_REGISTER_COST, DEFAULT_REQUEST_OVERHEAD
+
+BIT_TYPES = ("coil", "discrete_input")
+
+Block = tuple[str, int, int, list[str]]
+
+
+def get_register_type(definition: dict[str, Any]) -> tuple[str | None, int | None]:
+    """Return the register type and Lambdatronic address of a definition."""
+    if "coil" in definition:
+        return "coil", definition["coil"]
+    if "discrete_input" in definition:
+        return "discrete_input", definition["discrete_input"]
+
+    address = definition.get("register")
+    if address is None:
+        return None, None
+
+    if (
+        definition.get("type") in ("number", "select")
+        or (address >= 40001 and address < 50000)
+        or definition.get("register_type") == "holding"
+    ):
+        return "holding", address
+    return "input", address
+
+
+def element_cost(reg_type: str, register_cost: float) -> float:
+    """Return the wire cost of one element of the given register type.
+
+    Registers take two bytes in a response, coils and discrete inputs are
+    packed eight to a byte.
+    """
+    if reg_type in BIT_TYPES:
+        return register_cost / 16
+    return register_cost
+
+
+def block_cost(
+    reg_type: str,
+    count: int,
+    request_overhead: float = DEFAULT_REQUEST_OVERHEAD,
+    register_cost: float = DEFAULT_REGISTER_COST,
+) -> float:
+    """Return the estimated bus time in seconds of reading a single block."""
+    return request_overhead + count * element_cost(reg_type, register_cost)
+
+
+def estimate_bus_time(
+    blocks: Iterable[Block],
+    request_overhead: float = DEFAULT_REQUEST_OVERHEAD,
+    register_cost: float = DEFAULT_REGISTER_COST,
+) -> float:
+    """Return the estimated bus time in seconds of reading all blocks once."""
+    return sum(
+        block_cost(reg_type, count, request_overhead, register_cost)
+        for reg_type, _start, count, _entities in blocks
+    )
+
+
+def _plan_type(
+    reg_type: str,
+    registers: list[tuple[int, str]],
+    request_overhead: float,
+    register_cost: float,
+    block_size_limit: int,
+    holes: Iterable[int] = (),
+) -> list[Block]:
+    """Split the sorted registers of one type into the cheapest set of blocks.
+
+    Dynamic program over the distinct addresses: best[j] is the cheapest way
+    to read the first j addresses, extended by one block ending at address j.
+    Blocks never span an address the device rejects.
+    """
+    hole_set = set(holes)
+    sorted_holes = sorted(hole_set)
+    addresses = sorted(
+        {addr for addr, _entity_id in registers if addr not in hole_set}
+    )
+    entities_by_addr: dict[int, list[str]] = {}
+    for addr, entity_id in registers:
+        entities_by_addr.setdefault(addr, []).append(entity_id)
+
+    unit_cost = element_cost(reg_type, register_cost)
+    best = [0.0] + [float("inf")] * len(addresses)
+    split = [0] * (len(addresses) + 1)
+
+    for end in range(len(addresses)):
+        # Blocks ending here may not start before the closest hole below.
+        hole_index = bisect_left(sorted_holes, addresses[end])
+        lowest = sorted_holes[hole_index - 1] if hole_index else -1
+
+        start = end
+        while (
+            start >= 0
+            and addresses[start] > lowest
+            and addresses[end] - addresses[start] + 1 < block_size_limit
+        ):
+            cost = (
+                best[start]
+                + request_overhead
+                + (addresses[end] - addresses[start] + 1) * unit_cost
+            )
+            if cost < best[end + 1]:
+                best[end + 1] = cost
+                split[end + 1] = start
+            start -= 1
+
+    blocks: list[Block] = []
+    end = len(addresses)
+    while end > 0:
+        start = split[end]
+        first, last = addresses[start], addresses[end - 1]
+        blocks.append(
+            (
+                reg_type,
+                first,
+                last - first + 1,
+                [
+                    entity_id
+                    for addr in addresses[start:end]
+                    for entity_id in entities_by_addr[addr]
+                ],
+            )
+        )
+        end = start
+
+    blocks.reverse()
+    return blocks
+
+
+def group_registers(
+    entity_definitions: dict[str, Any],
+    request_overhead: float = DEFAULT_REQUEST_OVERHEAD,
+    register_cost: float = DEFAULT_REGISTER_COST,
+    block_size_limit: int = 122,
+    holes: dict[str, set[int]] | None = None,
+) -> list[Block]:
+    """Group the registers of the given entity definitions into read blocks.
+
+    Blocks are chosen to minimize the estimated bus time, where every request
+    costs a fixed round-trip overhead and every register read costs its time
+    on the wire, including the unused registers bridging gaps. Blocks span
+    fewer than block_size_limit addresses. Addresses in holes, per register
+    type, are left out and never bridged.
+    """
+    registers_by_type: dict[str, list[tuple[int, str]]] = {
+        "input": [],
+        "discrete_input": [],
+        "holding": [],
+        "coil": [],
+    }
+
+    for entity_id, definition in entity_definitions.items():
+        reg_type, address = get_register_type(definition)
+        if reg_type and address is not None:
+            registers_by_type[reg_type].append((address, entity_id))
+
+    blocks: list[Block] = []
+    for reg_type, registers in registers_by_type.items():
+        if registers:
+            blocks.extend(
+                _plan_type(
+                    reg_type,
+                    registers,
+                    request_overhead,
+                    register_cost,
+                    block_size_limit,
+                    (holes or {}).get(reg_type, ()),
+                )
+            )
+    return blocks
+
+
+def fit_cost_model(
+    samples: Iterable[tuple[str, int, float]],
+) -> tuple[float, float] | None:
+    """Fit request overhead and register cost to measured read durations.
+
+    Each sample is a (register type, count, seconds) tuple. Returns None if
+    the samples do not span enough block sizes for a least squares fit.
+    """
+    points = [
+        (count * element_cost(reg_type, 1.0), duration)
+        for reg_type, count, duration in samples
+    ]
+    if len({size for size, _duration in points}) < 2:
+        return None
+
+    n = len(points)
+    mean_size = sum(size for size, _duration in points) / n
+    mean_duration = sum(duration for _size, duration in points) / n
+    variance = sum((size - mean_size) ** 2 for size, _duration in points)
+    covariance = sum(
+        (size - mean_size) * (duration - mean_duration) for size, duration in points
+    )
+
+    register_cost = covariance / variance
+    request_overhead = mean_duration - register_cost * mean_size
+    if register_cost <= 0 or request_overhead <= 0:
+        return None
+    return request_overhead, register_cost
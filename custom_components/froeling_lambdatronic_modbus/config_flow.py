@@ -1,83 +1,208 @@
 """Fröling Lambdatronic Modbus Config Flow."""
 
+import asyncio
 import logging
 from typing import Any
 
 import voluptuous as vol
 
-from homeassistant import config_entries
-from homeassistant.core import callback
+from homeassistant import config_entries, data_entry_flow
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import selector
+import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.translation import async_get_translations
 
-from .const import DOMAIN
+from .block_planner import group_registers
+from .const import (
+    DEFAULT_RETRY_BUDGET,
+    DEFAULT_SLOW_INTERVAL,
+    DEFAULT_STALE_AFTER,
+    DOMAIN,
+    FRAME_GAP_PRESETS,
+)
+from .coordinator import async_read_raw_values
 from .entity_definitions import ENTITY_DEFINITIONS
-from .modbus_controller import ModbusController
+from .modbus_controller import PRIORITY_INTERACTIVE, ModbusController
 
 _LOGGER = logging.getLogger(__name__)
 
-async def _read_value_helper(
-    controller: ModbusController,
+# Options of an entry that belong to the connection to its bridge, which all
+# entries behind the bridge share.
+CONNECTION_OPTIONS = (
+    "timeout",
+    "reconnect_delay",
+    "framer",
+    "baudrate",
+    "parity",
+    "inter_char_timeout",
+    "pipeline_depth",
+    "frame_gap_preset",
+    "min_frame_gap",
+    "frame_gap_auto_tune",
+)
+
+
+def _format_preview_value(
     definition: dict[str, Any],
     entity_id: str,
     platform: str,
     translations: dict,
+    raw_value: Any,
 ) -> Any:
-    """Read a value from the controller for preview purposes."""
+    """Format a raw value for preview purposes."""
     try:
         if "coil" in definition:
-            result = await controller.async_read_coils(definition["coil"], count=1)
-            if result and not result.isError():
-                return result.bits[0]
-        elif "discrete_input" in definition:
-            result = await controller.async_read_discrete_inputs(definition["discrete_input"] - 10001, count=1)
-            if result and not result.isError():
-                return int(result.bits[0])
-        elif "register" in definition:
-            offset = (
-                40001
-                if definition.get("register_type") == "holding"
-                or definition.get("type") in ["number", "select"]
-                else 30001
-            )
-            read_method = (
-                controller.async_read_holding_registers
-                if offset == 40001
-                else controller.async_read_input_registers
-            )
+            return raw_value
+        if "discrete_input" in definition:
+            return int(raw_value)
 
-            result = await read_method(definition["register"] - offset, count=1)
+        if definition.get("type") == "text":
+            if entity_id.startswith("kessel_fehlerpuffer_"):
+                state_translation_key = f"component.froeling_lambdatronic_modbus.entity.sensor.kessel_fehler.state.{raw_value}"
+            else:
+                state_translation_key = f"component.froeling_lambdatronic_modbus.entity.{platform}.{entity_id}.state.{raw_value}"
+            return translations.get(state_translation_key, f"Unknown ({raw_value})")
+
+        if (
+            raw_value > 32767
+            and definition.get("register_type") != "holding"
+            and definition.get("type") not in ["number", "select"]
+        ):
+            raw_value -= 65536
+
+        scaling = definition.get("scaling", 1)
+        decimals = definition.get("decimals", 0)
+        scaled_value = raw_value / scaling
+
+        if decimals == 0:
+            return int(scaled_value)
+        return round(scaled_value, decimals)
+    except Exception as e:
+        _LOGGER.error("Error reading value for preview: %s", e)
+        return "Error reading value"
 
-            if result and not result.isError():
-                raw_value = result.registers[0]
 
-                if definition.get("type") == "text":
-                    if entity_id.startswith("kessel_fehlerpuffer_"):
-                        state_translation_key = f"component.froeling_lambdatronic_modbus.entity.sensor.kessel_fehler.state.{raw_value}"
-                    else:
-                        state_translation_key = f"component.froeling_lambdatronic_modbus.entity.{platform}.{entity_id}.state.{raw_value}"
-                    return translations.get(
-                        state_translation_key, f"Unknown ({raw_value})"
+def _create_controller(
+    hass: HomeAssistant, config: dict[str, Any]
+) -> ModbusController:
+    """Create a controller for a flow from the user input or entry config.
+
+    A flow only reads, so if the connection to the bridge is already open it
+    is used with the settings it was opened with.
+    """
+    host = config["host"]
+    port = config.get("port", 502)
+    connection = hass.data.get(DOMAIN, {}).get("connections", {}).get((host, port))
+    if connection is not None:
+        return ModbusController(
+            hass,
+            host,
+            port,
+            device_id=config.get("device_id", 2),
+            frame_gap_preset="custom",
+            **connection.settings,
+        )
+    return ModbusController(
+        hass,
+        host,
+        port,
+        device_id=config.get("device_id", 2),
+        framer=config.get("framer", "socket"),
+        baudrate=config.get("baudrate", 9600),
+        transport=config.get("transport", "tcp"),
+        parity=config.get("parity", "N"),
+        inter_char_timeout=config.get("inter_char_timeout", 0.05),
+    )
+
+
+def _connection_settings(config: dict[str, Any]) -> dict[str, Any]:
+    """Return the settings an entry config opens the connection to its bridge with.
+
+    Matches the settings ModbusConnection.acquire compares.
+    """
+    return {
+        "timeout": config.get("timeout", 10),
+        "reconnect_delay": config.get("reconnect_delay", 30),
+        "framer": config.get("framer", "socket"),
+        "baudrate": config.get("baudrate", 9600),
+        "transport": config.get("transport", "tcp"),
+        "parity": config.get("parity", "N"),
+        "inter_char_timeout": config.get("inter_char_timeout", 0.05),
+        "pipeline_depth": config.get("pipeline_depth", 1),
+        "min_frame_gap": FRAME_GAP_PRESETS.get(
+            config.get("frame_gap_preset", "none"), config.get("min_frame_gap", 0.0)
+        ),
+        "frame_gap_auto_tune": config.get("frame_gap_auto_tune", False),
+    }
+
+
+async def _async_read_preview_options(
+    flow: data_entry_flow.FlowHandler, config: dict[str, Any]
+) -> dict[str, list[dict[str, str]]] | None:
+    """Read the current values of all selected categories for the entity form.
+
+    Each category is read in blocks using the coordinator's block planner and
+    the flow progress is updated after every category. Returns None if the
+    device cannot be reached.
+    """
+    controller = _create_controller(flow.hass, config)
+
+    if not await controller.async_check_connection(PRIORITY_INTERACTIVE):
+        await controller.async_close()
+        return None
+
+    translations = await async_get_translations(
+        flow.hass, flow.hass.config.language, "entity", integrations=[DOMAIN]
+    )
+
+    categories = [
+        category
+        for category in config.get("categories", [])
+        if category in ENTITY_DEFINITIONS
+    ]
+    options_by_category: dict[str, list[dict[str, str]]] = {}
+
+    try:
+        for index, category in enumerate(categories):
+            definitions = ENTITY_DEFINITIONS[category]
+            raw_values = await async_read_raw_values(
+                controller,
+                group_registers(definitions),
+                definitions,
+                priority=PRIORITY_INTERACTIVE,
+            )
+
+            options = []
+            for entity_id, definition in definitions.items():
+                platform = definition.get("type", "sensor")
+                if platform == "binary_sensor_from_register":
+                    platform = "binary_sensor"
+                if platform == "text":
+                    platform = "sensor"
+                translation_key = f"component.froeling_lambdatronic_modbus.entity.{platform}.{entity_id}.name"
+                translated_name = translations.get(translation_key, entity_id)
+
+                if entity_id in raw_values:
+                    value = _format_preview_value(
+                        definition,
+                        entity_id,
+                        platform,
+                        translations,
+                        raw_values[entity_id],
                     )
+                else:
+                    value = "N/A"
 
-                if (
-                    raw_value > 32767
-                    and definition.get("register_type") != "holding"
-                    and definition.get("type") not in ["number", "select"]
-                ):
-                    raw_value -= 65536
+                options.append(
+                    {"label": f"{translated_name}: {value}", "value": entity_id}
+                )
 
-                scaling = definition.get("scaling", 1)
-                decimals = definition.get("decimals", 0)
-                scaled_value = raw_value / scaling
+            options_by_category[category] = options
+            flow.async_update_progress((index + 1) / len(categories))
+    finally:
+        await controller.async_close()
 
-                if decimals == 0:
-                    return int(scaled_value)
-                return round(scaled_value, decimals)
-    except Exception as e:
-        _LOGGER.error("Error reading value for preview: %s", e)
-        return "Error reading value"
-    return "N/A"
+    return options_by_category
 
 
 class FroelingModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -88,28 +213,41 @@ class FroelingModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def __init__(self) -> None:
         """Initialize the config flow."""
         self.config: dict[str, Any] = {}
+        self._preview_task: asyncio.Task | None = None
+        self._preview_options: dict[str, list[dict[str, str]]] | None = None
 
     async def async_step_user(self, user_input: dict[str, Any] | None = None):
         """Handle the initial step."""
         errors = {}
 
         if user_input is not None:
-            controller = ModbusController(
-                self.hass,
-                user_input["host"],
-                user_input["port"],
-                device_id=user_input.get("device_id", 2),
-            )
+            controller = _create_controller(self.hass, user_input)
 
-            if await controller.async_check_connection():
-                read_result = await controller.async_read_input_registers(0, count=1)
+            if await controller.async_check_connection(PRIORITY_INTERACTIVE):
+                read_result = await controller.async_read_input_registers(
+                    0, count=1, priority=PRIORITY_INTERACTIVE
+                )
                 await controller.async_close()
 
                 if read_result is None:
                     errors["base"] = "invalid_device_id"
                 else:
+                    for entry in self._async_current_entries():
+                        entry_config = {**entry.data, **entry.options}
+                        if (entry_config.get("host"), entry_config.get("port", 502)) == (
+                            user_input["host"],
+                            user_input["port"],
+                        ):
+                            self.config.update(
+                                {
+                                    key: entry_config[key]
+                                    for key in CONNECTION_OPTIONS
+                                    if key in entry_config
+                                }
+                            )
+                            break
                     self.config.update(user_input)
-                    return await self.async_step_entities()
+                    return await self.async_step_preview()
             else:
                 await controller.async_close()
                 errors["base"] = "cannot_connect"
@@ -119,8 +257,16 @@ class FroelingModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=vol.Schema(
                 {
                     vol.Required("name", default="Froeling"): str,
+                    vol.Required("transport", default="tcp"): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=["tcp", "serial"],
+                            mode=selector.SelectSelectorMode.DROPDOWN,
+                            translation_key="transport",
+                        ),
+                    ),
                     vol.Required("host"): str,
                     vol.Required("port", default=502): int,
+                    vol.Required("baudrate", default=9600): int,
                     vol.Required("device_id", default=2): int,
                     vol.Required("update_interval", default=60): int,
                     vol.Required(
@@ -138,6 +284,33 @@ class FroelingModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_preview(self, user_input: dict[str, Any] | None = None):
+        """Read the current values of the selected categories."""
+        if self._preview_task is None:
+            self._preview_task = self.hass.async_create_task(
+                _async_read_preview_options(self, self.config)
+            )
+
+        if not self._preview_task.done():
+            return self.async_show_progress(
+                step_id="preview",
+                progress_action="read_values",
+                progress_task=self._preview_task,
+            )
+
+        self._preview_options = self._preview_task.result()
+        self._preview_task = None
+
+        if self._preview_options is None:
+            return self.async_show_progress_done(next_step_id="cannot_connect")
+        return self.async_show_progress_done(next_step_id="entities")
+
+    async def async_step_cannot_connect(
+        self, user_input: dict[str, Any] | None = None
+    ):
+        """Abort the flow after the preview could not connect."""
+        return self.async_abort(reason="cannot_connect")
+
     async def async_step_entities(self, user_input: dict[str, Any] | None = None):
         """Handle the entities step."""
         if user_input is not None:
@@ -145,54 +318,18 @@ class FroelingModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             return self.async_create_entry(title=self.config["name"], data=self.config)
 
         schema = {}
-        controller = ModbusController(
-            self.hass,
-            self.config["host"],
-            self.config["port"],
-            device_id=self.config.get("device_id", 2),
-        )
-
-        if not await controller.async_check_connection():
-            await controller.async_close()
-            return self.async_abort(reason="cannot_connect")
-
-        translations = await async_get_translations(
-            self.hass, self.hass.config.language, "entity", integrations=[DOMAIN]
-        )
-
-        for category in self.config.get("categories", []):
-            if category in ENTITY_DEFINITIONS:
-                options = []
-                for entity_id, definition in ENTITY_DEFINITIONS[category].items():
-                    platform = definition.get("type", "sensor")
-                    if platform == "binary_sensor_from_register":
-                        platform = "binary_sensor"
-                    if platform == "text":
-                        platform = "sensor"
-                    translation_key = f"component.froeling_lambdatronic_modbus.entity.{platform}.{entity_id}.name"
-                    translated_name = translations.get(translation_key, entity_id)
-
-                    value = await _read_value_helper(
-                        controller, definition, entity_id, platform, translations
-                    )
-
-                    options.append(
-                        {"label": f"{translated_name}: {value}", "value": entity_id}
-                    )
-
-                default_values = [opt["value"] for opt in options]
-
-                schema[vol.Required(category, default=default_values)] = (
-                    selector.SelectSelector(
-                        selector.SelectSelectorConfig(
-                            options=options,
-                            multiple=True,
-                            mode=selector.SelectSelectorMode.LIST,
-                        ),
-                    )
+        for category, options in (self._preview_options or {}).items():
+            default_values = [opt["value"] for opt in options]
+
+            schema[vol.Required(category, default=default_values)] = (
+                selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=options,
+                        multiple=True,
+                        mode=selector.SelectSelectorMode.LIST,
+                    ),
                 )
-
-        await controller.async_close()
+            )
 
         return self.async_show_form(
             step_id="entities",
@@ -209,71 +346,216 @@ class FroelingModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 class FroelingOptionsFlowHandler(config_entries.OptionsFlow):
     """Handle options flow for Fröling Lambdatronic Modbus."""
 
+    def __init__(self) -> None:
+        """Initialize the options flow."""
+        self._preview_task: asyncio.Task | None = None
+        self._preview_options: dict[str, list[dict[str, str]]] | None = None
+        self._entities: dict[str, list[str]] = {}
+        self._options: dict[str, Any] = {}
+
     async def async_step_init(self, user_input: dict[str, Any] | None = None):
-        """Handle the initial options step."""
-        if user_input is not None:
-            new_options = dict(self.config_entry.options)
-            new_options["entities"] = user_input
-            return self.async_create_entry(title="", data=new_options)
+        """Read the current values of the configured categories."""
+        if self._preview_task is None:
+            config = {**self.config_entry.data, **self.config_entry.options}
+            self._preview_task = self.hass.async_create_task(
+                _async_read_preview_options(self, config)
+            )
 
-        config = {**self.config_entry.data, **self.config_entry.options}
+        if not self._preview_task.done():
+            return self.async_show_progress(
+                step_id="init",
+                progress_action="read_values",
+                progress_task=self._preview_task,
+            )
 
-        translations = await async_get_translations(
-            self.hass, self.hass.config.language, "entity", integrations=[DOMAIN]
-        )
+        self._preview_options = self._preview_task.result()
+        self._preview_task = None
 
-        schema = {}
-        controller = ModbusController(
-            self.hass,
-            config["host"],
-            config["port"],
-            device_id=config.get("device_id", 2),
-        )
+        if self._preview_options is None:
+            return self.async_show_progress_done(next_step_id="cannot_connect")
+        return self.async_show_progress_done(next_step_id="entities")
 
-        if not await controller.async_check_connection():
-            await controller.async_close()
-            return self.async_abort(reason="cannot_connect")
+    async def async_step_cannot_connect(
+        self, user_input: dict[str, Any] | None = None
+    ):
+        """Abort the flow after the preview could not connect."""
+        return self.async_abort(reason="cannot_connect")
+
+    async def async_step_entities(self, user_input: dict[str, Any] | None = None):
+        """Handle the entities step."""
+        if user_input is not None:
+            self._entities = user_input
+            return await self.async_step_intervals()
 
+        config = {**self.config_entry.data, **self.config_entry.options}
         current_entities = config.get("entities", {})
 
-        for category in config.get("categories", []):
-            if category in ENTITY_DEFINITIONS:
-                options = []
-                default_values = []
-
-                for entity_id, definition in ENTITY_DEFINITIONS[category].items():
-                    platform = definition.get("type", "sensor")
-                    if platform == "binary_sensor_from_register":
-                        platform = "binary_sensor"
-                    if platform == "text":
-                        platform = "sensor"
-                    translation_key = f"component.froeling_lambdatronic_modbus.entity.{platform}.{entity_id}.name"
-                    translated_name = translations.get(translation_key, entity_id)
-
-                    value = await _read_value_helper(
-                        controller, definition, entity_id, platform, translations
+        schema = {}
+        for category, options in (self._preview_options or {}).items():
+            default_values = [
+                opt["value"]
+                for opt in options
+                if opt["value"] in current_entities.get(category, [])
+            ]
+
+            schema[vol.Required(category, default=default_values)] = (
+                selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=options,
+                        multiple=True,
+                        mode=selector.SelectSelectorMode.LIST,
                     )
+                )
+            )
 
-                    options.append(
-                        {"label": f"{translated_name}: {value}", "value": entity_id}
-                    )
+        return self.async_show_form(step_id="entities", data_schema=vol.Schema(schema))
 
-                    if (
-                        category in current_entities
-                        and entity_id in current_entities.get(category, [])
-                    ):
-                        default_values.append(entity_id)
+    async def async_step_intervals(self, user_input: dict[str, Any] | None = None):
+        """Handle the polling interval of each tier."""
+        if user_input is not None:
+            self._options.update(user_input)
+            return await self.async_step_connection()
 
-                schema[vol.Required(category, default=default_values)] = (
-                    selector.SelectSelector(
-                        selector.SelectSelectorConfig(
-                            options=options,
-                            multiple=True,
-                            mode=selector.SelectSelectorMode.LIST,
-                        )
-                    )
-                )
+        config = {**self.config_entry.data, **self.config_entry.options}
+        update_interval = config.get("update_interval", 60)
 
-        await controller.async_close()
+        return self.async_show_form(
+            step_id="intervals",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        "fast_interval",
+                        default=config.get("fast_interval", update_interval),
+                    ): cv.positive_int,
+                    vol.Required(
+                        "update_interval", default=update_interval
+                    ): cv.positive_int,
+                    vol.Required(
+                        "slow_interval",
+                        default=config.get("slow_interval", DEFAULT_SLOW_INTERVAL),
+                    ): cv.positive_int,
+                    vol.Required(
+                        "retry_budget",
+                        default=config.get("retry_budget", DEFAULT_RETRY_BUDGET),
+                    ): cv.positive_int,
+                    vol.Required(
+                        "stale_after",
+                        default=config.get("stale_after", DEFAULT_STALE_AFTER),
+                    ): cv.positive_int,
+                }
+            ),
+        )
+
+    async def async_step_connection(self, user_input: dict[str, Any] | None = None):
+        """Handle how the boiler is talked to."""
+        config = {**self.config_entry.data, **self.config_entry.options}
 
-        return self.async_show_form(step_id="init", data_schema=vol.Schema(schema))
+        if user_input is not None:
+            config.update(user_input)
+            self._async_share_connection_options(config)
+            new_options = dict(self.config_entry.options)
+            new_options.update(self._options)
+            new_options.update(user_input)
+            new_options["entities"] = self._entities
+            return self.async_create_entry(title="", data=new_options)
+
+        return self.async_show_form(
+            step_id="connection",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        "framer", default=config.get("framer", "socket")
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=["socket", "rtu"],
+                            mode=selector.SelectSelectorMode.DROPDOWN,
+                            translation_key="framer",
+                        ),
+                    ),
+                    vol.Required(
+                        "baudrate", default=config.get("baudrate", 9600)
+                    ): cv.positive_int,
+                    vol.Required(
+                        "parity", default=config.get("parity", "N")
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=["N", "E", "O"],
+                            mode=selector.SelectSelectorMode.DROPDOWN,
+                            translation_key="parity",
+                        ),
+                    ),
+                    vol.Required(
+                        "inter_char_timeout",
+                        default=config.get("inter_char_timeout", 0.05),
+                    ): cv.positive_float,
+                    vol.Required(
+                        "pipeline_depth", default=config.get("pipeline_depth", 1)
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=8)),
+                    vol.Required(
+                        "frame_gap_preset",
+                        default=config.get("frame_gap_preset", "none"),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[*FRAME_GAP_PRESETS, "custom"],
+                            mode=selector.SelectSelectorMode.DROPDOWN,
+                            translation_key="frame_gap_preset",
+                        ),
+                    ),
+                    vol.Required(
+                        "min_frame_gap", default=config.get("min_frame_gap", 0.0)
+                    ): cv.positive_float,
+                    vol.Required(
+                        "frame_gap_auto_tune",
+                        default=config.get("frame_gap_auto_tune", False),
+                    ): cv.boolean,
+                    vol.Required(
+                        "write_mode", default=config.get("write_mode", "write_read")
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=["write_read", "fc23"],
+                            mode=selector.SelectSelectorMode.DROPDOWN,
+                            translation_key="write_mode",
+                        ),
+                    ),
+                    vol.Required(
+                        "write_delay", default=config.get("write_delay", 0.5)
+                    ): cv.positive_float,
+                    vol.Required(
+                        "timeout_floor", default=config.get("timeout_floor", 0.3)
+                    ): cv.positive_float,
+                    vol.Required(
+                        "timeout", default=config.get("timeout", 10)
+                    ): cv.positive_float,
+                    vol.Required(
+                        "record_traffic", default=config.get("record_traffic", False)
+                    ): cv.boolean,
+                }
+            ),
+        )
+
+    @callback
+    def _async_share_connection_options(self, config: dict[str, Any]) -> None:
+        """Apply changed connection options to the other entries on the bridge.
+
+        The connection to a bridge is shared, so all its entries have to use
+        the same settings. Each updated entry reloads; one set up while the
+        connection is still open with the old settings retries until the
+        others released it.
+        """
+        shared = {key: config[key] for key in CONNECTION_OPTIONS if key in config}
+        for entry in self.hass.config_entries.async_entries(DOMAIN):
+            entry_config = {**entry.data, **entry.options}
+            if entry.entry_id == self.config_entry.entry_id or (
+                entry_config.get("host"),
+                entry_config.get("port", 502),
+            ) != (config["host"], config.get("port", 502)):
+                continue
+            if _connection_settings(entry_config) == _connection_settings(
+                {**entry_config, **shared}
+            ):
+                continue
+            # Reloading removes the entities missing from the options.
+            options = {"entities": entry_config.get("entities", {})}
+            options.update(entry.options)
+            options.update(shared)
+            self.hass.config_entries.async_update_entry(entry, options=options)
@@ -1,3 +1,35 @@
 """Constants for the Fröling Lambdatronic Modbus integration."""
 
 DOMAIN = "froeling_lambdatronic_modbus"
+
+# Estimated bus time of a read request: a fixed round-trip overhead per request
+# (gateway latency plus RTU framing) and the wire time of every register read,
+# both in seconds. The register cost is two bytes at 9600 baud 8N1.
+DEFAULT_REQUEST_OVERHEAD = 0.05
+DEFAULT_REGISTER_COST = 0.00208
+
+# Polling tiers set with "tier" in ENTITY_DEFINITIONS. Entities without a tier
+# are polled on the normal interval (update_interval), numbers and selects on
+# the slow interval. On demand entities are only read on the first refresh and
+# after a write.
+POLL_TIERS = ("fast", "normal", "slow", "on_demand")
+DEFAULT_SLOW_INTERVAL = 600
+
+# Requests per poll cycle spent on reading failed blocks again in halves, so a
+# single lost answer doesn't make every entity of a block unavailable.
+DEFAULT_RETRY_BUDGET = 8
+
+# Seconds an entity whose reads fail keeps its last good value before it
+# becomes unavailable. Longer than the default slow interval, so a single
+# failed read of a slow entity is bridged as well.
+DEFAULT_STALE_AFTER = 900
+
+# Minimum silent interval in seconds between an answer and the next request
+# for the converters documented in the README, which lose requests arriving
+# while their serial buffer is still being drained. "custom" takes the
+# configured min_frame_gap instead.
+FRAME_GAP_PRESETS = {
+    "none": 0.0,
+    "waveshare_rs232_485_eth": 0.02,
+    "waveshare_rs232_485_422_poe_eth_b": 0.01,
+}
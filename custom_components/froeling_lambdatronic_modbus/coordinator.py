@@ -2,22 +2,179 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterable
 from datetime import timedelta
 import logging
+import math
+import time
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from homeassistant.helpers.translation import async_get_translations
 
-from .const import DOMAIN
+from .block_planner import (
+    BIT_TYPES,
+    Block,
+    estimate_bus_time,
+    fit_cost_model,
+    group_registers,
+)
+from .const import (
+    DEFAULT_REGISTER_COST,
+    DEFAULT_REQUEST_OVERHEAD,
+    DEFAULT_RETRY_BUDGET,
+    DEFAULT_SLOW_INTERVAL,
+    DEFAULT_STALE_AFTER,
+    DOMAIN,
+    POLL_TIERS,
+)
+from .decoding import DecodeTable, compile_block, decode_block
 from .entity_definitions import ENTITY_DEFINITIONS
-from .modbus_controller import ModbusController
+from .modbus_controller import (
+    CIRCUIT_OPEN,
+    PRIORITY_POLL,
+    ModbusController,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+ILLEGAL_DATA_ADDRESS = 0x02
+HOLES_STORAGE_VERSION = 1
+HOLES_SAVE_DELAY = 10
+# Poll cycles kept in the trace ring buffer for diagnostics.
+TRACE_CYCLES = 20
+# Seconds between state writes of an entity holding its last good value, so
+# its value_age attribute keeps up without a write every cycle.
+HELD_AGE_INTERVAL = 300
+
+
+def get_poll_tier(definition: dict[str, Any]) -> str:
+    """Return the polling tier of an entity definition."""
+    if "tier" in definition:
+        return definition["tier"]
+    if definition.get("type") in ("number", "select"):
+        return "slow"
+    return "normal"
+
+
+def _is_illegal_address(result: Any) -> bool:
+    """Return True if the device rejected a read with illegal data address."""
+    return (
+        result is not None
+        and result.isError()
+        and getattr(result, "exception_code", None) == ILLEGAL_DATA_ADDRESS
+    )
+
+
+def _describe_result(result: Any) -> str:
+    """Describe the outcome of a block read for the poll cycle trace."""
+    if result is None:
+        return "no response"
+    if result.isError():
+        return f"exception {getattr(result, 'exception_code', None)}"
+    return "ok"
+
+
+def _halves(entity_ids: list[str]) -> list[list[str]]:
+    """Split the entities of a block in two, or return a single entity as is."""
+    if len(entity_ids) == 1:
+        return [entity_ids]
+    middle = len(entity_ids) // 2
+    return [entity_ids[:middle], entity_ids[middle:]]
+
+
+async def async_read_halves(
+    controller: ModbusController,
+    block: Block,
+    plan: Callable[[list[str]], list[Block]],
+    read: Callable[[Block], Awaitable[Any]],
+    budget: int,
+) -> tuple[list[tuple[Block, Any]], int]:
+    """Read the entities of a failed block again in halves.
+
+    A single corrupted or lost answer, or an address the device rejects,
+    shouldn't leave every entity of a block unread. Each half that fails
+    again is split further, down to single entities, while budget requests
+    are left and the circuit is closed. plan groups entity ids into blocks
+    and read reads one. Returns the blocks read with their results and the
+    budget left.
+    """
+    read_blocks: list[tuple[Block, Any]] = []
+    pending = list(reversed(_halves(block[3])))
+    while pending and budget > 0:
+        entities = pending.pop()
+        for sub_block in plan(entities):
+            if budget == 0 or controller.circuit.state == CIRCUIT_OPEN:
+                return read_blocks, budget
+            budget -= 1
+            result = await read(sub_block)
+            if result and not result.isError():
+                read_blocks.append((sub_block, result))
+            elif len(sub_block[3]) > 1:
+                pending.extend(reversed(_halves(sub_block[3])))
+    return read_blocks, budget
+
+
+async def async_read_raw_values(
+    controller: ModbusController,
+    blocks: list[tuple[str, int, int, list[str]]],
+    entity_definitions: dict[str, Any],
+    priority: int = PRIORITY_POLL,
+) -> dict[str, Any]:
+    """Read the given blocks and return the undecoded value of each entity.
+
+    A block that can't be read is read again in halves, see
+    async_read_halves, so only the entities that really couldn't be read are
+    left out of the result.
+    """
+    raw_values: dict[str, Any] = {}
+
+    def plan(entity_ids: list[str]) -> list[Block]:
+        return group_registers(
+            {entity_id: entity_definitions[entity_id] for entity_id in entity_ids}
+        )
+
+    async def read(block: Block) -> Any:
+        block_type, start_addr, count, _entities_in_block = block
+        return await controller.async_read_block(
+            block_type, start_addr, count, priority=priority
+        )
+
+    for block in blocks:
+        block_type, start_addr, _count, entities_in_block = block
+        result = await read(block)
+        if result and not result.isError():
+            read_blocks = [(block, result)]
+        else:
+            _LOGGER.debug(
+                "Failed to read %s block at address %s", block_type, start_addr
+            )
+            # Enough requests to isolate every entity of the block.
+            read_blocks, _budget = await async_read_halves(
+                controller, block, plan, read, 2 * len(entities_in_block)
+            )
+
+        for (block_type, start_addr, _count, entities), result in read_blocks:
+            values = result.bits if block_type in BIT_TYPES else result.registers
+            for entity_id in entities:
+                definition = entity_definitions[entity_id]
+                reg_addr = definition.get(
+                    "register", definition.get("coil", definition.get("discrete_input"))
+                )
+                offset = reg_addr - start_addr
+                if offset < len(values):
+                    raw_values[entity_id] = values[offset]
+
+    return raw_values
+
+
 class FroelingDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Class to manage fetching data from the Fröling Modbus interface."""
 
@@ -34,13 +191,81 @@ class FroelingDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self._entity_definitions = self._get_active_entity_definitions()
         self.translations = None
 
+        # Entities whose value changed in the last update. After a failed or
+        # first update every entity writes its state.
+        self._changed_entities: set[str] = set()
+        self._notify_all = True
+        self.state_writes = 0
+        self.suppressed_writes = 0
+
+        # The cost model is fitted to the measured reads, unless it is fixed
+        # in the config, as the benchmarks do for repeatable block plans.
+        self._measure_cost_model = (
+            "request_overhead_ms" not in config and "register_cost_ms" not in config
+        )
+        self.request_overhead = (
+            config.get("request_overhead_ms", DEFAULT_REQUEST_OVERHEAD * 1000) / 1000
+        )
+        self.register_cost = (
+            config.get("register_cost_ms", DEFAULT_REGISTER_COST * 1000) / 1000
+        )
+
+        self._holes: dict[str, set[int]] = {
+            "input": set(),
+            "discrete_input": set(),
+            "holding": set(),
+            "coil": set(),
+        }
+        self._store: Store[dict[str, list[int]]] = Store(
+            hass, HOLES_STORAGE_VERSION, f"{DOMAIN}.{config_entry.entry_id}.holes"
+        )
+
+        normal_interval = config.get("update_interval", 60)
+        self._tier_intervals = {
+            "fast": config.get("fast_interval", normal_interval),
+            "normal": normal_interval,
+            "slow": config.get("slow_interval", DEFAULT_SLOW_INTERVAL),
+        }
+        self._tier_entities: dict[str, list[str]] = {tier: [] for tier in POLL_TIERS}
+        for entity_id, definition in self._entity_definitions.items():
+            self._tier_entities[get_poll_tier(definition)].append(entity_id)
+        self._next_poll: dict[str, float] = {}
+        # Requests per cycle spent on reading failed blocks again in halves.
+        self._retry_budget = config.get("retry_budget", DEFAULT_RETRY_BUDGET)
+        self._tier_blocks: dict[
+            frozenset[str], list[tuple[Block, DecodeTable]]
+        ] = {}
+
         self._read_blocks = self._group_registers()
 
+        # Traces of the last poll cycles and the wall clock time each entity
+        # was last read, for diagnostics.
+        self.traces: deque[dict[str, Any]] = deque(maxlen=TRACE_CYCLES)
+        self.read_at: dict[str, float] = {}
+
+        # Monotonic time of the last good read of each entity. Entities whose
+        # last read failed keep their last good value until it is older than
+        # stale_after seconds, then they become unavailable.
+        self._stale_after = config.get("stale_after", DEFAULT_STALE_AFTER)
+        self._good_at: dict[str, float] = {}
+        self._failing: set[str] = set()
+        self._stale: set[str] = set()
+        # Monotonic time the state of each held entity was last written.
+        self._held_written: dict[str, float] = {}
+
+        polled_intervals = [
+            interval
+            for tier, interval in self._tier_intervals.items()
+            if self._tier_entities[tier]
+        ]
+
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=config.get("update_interval", 60)),
+            update_interval=timedelta(
+                seconds=min(polled_intervals, default=normal_interval)
+            ),
             config_entry=config_entry,
         )
 
@@ -54,151 +279,233 @@ class FroelingDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             if entity_id in ENTITY_DEFINITIONS[category]
         }
 
-    def _group_registers(
-        self, max_gap: int = 5, block_size_limit: int = 122
-    ) -> list[tuple[str, int, int, list[str]]]:
+    def _group_registers(self, entity_ids: Iterable[str] | None = None) -> list[Block]:
         """Group registers into blocks for efficient reading."""
-        registers_by_type: dict[str, list[tuple[int, str]]] = {
-            "input": [],
-            "discrete_input": [],
-            "holding": [],
-            "coil": [],
-        }
+        definitions = self._entity_definitions
+        if entity_ids is not None:
+            definitions = {
+                entity_id: self._entity_definitions[entity_id]
+                for entity_id in entity_ids
+            }
+        return group_registers(
+            definitions,
+            self.request_overhead,
+            self.register_cost,
+            holes=self._holes,
+        )
 
-        for entity_id, definition in self._entity_definitions.items():
-            address = definition.get("register")
-            reg_type = None
-
-            if "coil" in definition:
-                reg_type = "coil"
-                address = definition["coil"]
-            elif "discrete_input" in definition:
-                reg_type = "discrete_input"
-                address = definition["discrete_input"]
-            elif address is not None:
-                entity_type = definition.get("type")
-
-                if (
-                    entity_type in ("number", "select")
-                    or (address >= 40001 and address < 50000)
-                    or definition.get("register_type") == "holding"
-                ):
-                    reg_type = "holding"
-                else:
-                    reg_type = "input"
+    def _replan(self) -> None:
+        """Rebuild the read blocks and drop the cached per-tier plans."""
+        self._read_blocks = self._group_registers()
+        self._tier_blocks.clear()
+
+    def _due_tiers(self) -> frozenset[str]:
+        """Return the polling tiers due in this cycle."""
+        if self.data is None:
+            return frozenset(POLL_TIERS)
+
+        # Allow half a tick of slack so scheduling jitter doesn't skip a cycle.
+        deadline = time.monotonic() + self.update_interval.total_seconds() / 2
+        return frozenset(
+            tier
+            for tier in self._tier_intervals
+            if self._tier_entities[tier] and self._next_poll.get(tier, 0) <= deadline
+        )
 
-            if reg_type and address is not None:
-                registers_by_type[reg_type].append((address, entity_id))
+    def _blocks_for_tiers(
+        self, tiers: frozenset[str]
+    ) -> list[tuple[Block, DecodeTable]]:
+        """Return the merged read blocks of the given tiers with their decode tables."""
+        blocks = self._tier_blocks.get(tiers)
+        if blocks is None:
+            blocks = self._tier_blocks[tiers] = [
+                (block, self._compile_block(block))
+                for block in self._group_registers(
+                    entity_id
+                    for tier in tiers
+                    for entity_id in self._tier_entities[tier]
+                )
+            ]
+        return blocks
 
-        blocks = []
-        for reg_type, registers in registers_by_type.items():
-            if not registers:
-                continue
+    def _compile_block(self, block: Block) -> DecodeTable:
+        """Compile the decode table of a read block."""
+        return compile_block(block, self._entity_definitions, self._text_decoder)
 
-            registers.sort(key=lambda x: x[0])
+    def _text_decoder(self, translation_key: str | None) -> Callable[[int], str]:
+        """Return the decoder translating the state of a text entity."""
+        prefix = f"component.{DOMAIN}.entity.sensor.{translation_key}.state."
 
-            current_block_start = -1
-            current_block_entities: list[str] = []
-            last_addr_in_block = -1
+        def decode(raw_value: int) -> str:
+            if translation_key:
+                translated = self.translations.get(f"{prefix}{raw_value}")
+                if translated:
+                    return translated
+            return f"Unknown ({raw_value})"
 
-            for i, (addr, entity_id) in enumerate(registers):
+        return decode
 
-                if current_block_start == -1:
-                    current_block_start = addr
-                    last_addr_in_block = addr
-                    current_block_entities = [entity_id]
-                else:
-                    is_gap_too_big = (addr - last_addr_in_block) > max_gap
-                    is_block_too_big = (
-                        addr - current_block_start + 1
-                    ) >= block_size_limit
-
-                    if is_gap_too_big or is_block_too_big:
-                        count = (last_addr_in_block - current_block_start) + 1
-                        blocks.append(
-                            (
-                                reg_type,
-                                current_block_start,
-                                count,
-                                current_block_entities,
-                            )
-                        )
-
-                        current_block_start = addr
-                        current_block_entities = [entity_id]
-                    else:
-
-                        current_block_entities.append(entity_id)
-
-                    last_addr_in_block = addr
-
-                if i == len(registers) - 1:
-                    count = (last_addr_in_block - current_block_start) + 1
-                    blocks.append(
-                        (reg_type, current_block_start, count, current_block_entities)
-                    )
-        return blocks
+    @property
+    def estimated_bus_time(self) -> float:
+        """Return the estimated bus time in seconds of reading every entity once."""
+        return estimate_bus_time(
+            self._read_blocks, self.request_overhead, self.register_cost
+        )
 
-    async def async_refresh_entity(self, entity_id: str) -> None:
-        """Fetch data for a single entity and update state."""
-        definition = self._entity_definitions.get(entity_id)
-        if not definition:
+    @property
+    def estimated_bus_load(self) -> float:
+        """Return the estimated fraction of time the bus is busy polling."""
+        return sum(
+            estimate_bus_time(
+                (block for block, _table in self._blocks_for_tiers(frozenset((tier,)))),
+                self.request_overhead,
+                self.register_cost,
+            )
+            / interval
+            for tier, interval in self._tier_intervals.items()
+            if self._tier_entities[tier]
+        )
+
+    def _update_cost_model(self) -> None:
+        """Refit the cost model to measured reads and replan if it moved."""
+        fitted = fit_cost_model(self.controller.timing_samples)
+        if fitted is None:
             return
 
-        address = definition.get("register")
-        coil_address = definition.get("coil")
-        discrete_input_address = definition.get("discrete_input")
+        request_overhead, register_cost = fitted
+        if (
+            abs(request_overhead - self.request_overhead) <= 0.25 * self.request_overhead
+            and abs(register_cost - self.register_cost) <= 0.25 * self.register_cost
+        ):
+            return
 
-        value = None
-        read_success = False
+        self.request_overhead = request_overhead
+        self.register_cost = register_cost
+        self._replan()
+        _LOGGER.debug(
+            "Measured request overhead %.1f ms and register cost %.2f ms, "
+            "replanned into %s blocks (estimated %.0f ms per cycle)",
+            request_overhead * 1000,
+            register_cost * 1000,
+            len(self._read_blocks),
+            self.estimated_bus_time * 1000,
+        )
 
-        if coil_address is not None:
-            result = await self.controller.async_read_coils(coil_address, 1)
-            if result and not result.isError():
-                value = result.bits[0]
-                read_success = True
-        elif discrete_input_address is not None:
-            result = await self.controller.async_read_discrete_inputs(
-                discrete_input_address - 10001, 1
-            )
-            if result and not result.isError():
-                value = result.bits[0]
-                read_success = True
-        elif address is not None:
-            entity_type = definition.get("type")
-            reg_type = definition.get("register_type")
-
-            is_holding = (
-                entity_type in ("number", "select")
-                or (40001 <= address < 50000)
-                or reg_type == "holding"
-            )
+    def entity_changed(self, entity_id: str) -> bool:
+        """Return True if an entity needs to write its state after an update."""
+        if self._notify_all or entity_id in self._changed_entities:
+            self.state_writes += 1
+            return True
+        self.suppressed_writes += 1
+        return False
+
+    def entity_available(self, entity_id: str) -> bool:
+        """Return False if an entity could not be read for too long."""
+        return entity_id not in self._stale
+
+    def value_age(self, entity_id: str) -> float | None:
+        """Return the seconds since the value of an entity was last read."""
+        good_at = self._good_at.get(entity_id)
+        if good_at is None:
+            return None
+        return time.monotonic() - good_at
+
+    def _mark_read(self, entity_ids: Iterable[str]) -> None:
+        """Record that entities were read successfully just now."""
+        now = time.time()
+        now_monotonic = time.monotonic()
+        for entity_id in entity_ids:
+            self.read_at[entity_id] = now
+            self._good_at[entity_id] = now_monotonic
+            self._failing.discard(entity_id)
+            self._held_written.pop(entity_id, None)
+
+    def _update_held(self) -> set[str]:
+        """Recompute the stale entities; return those that need a state write.
+
+        Entities write their state when they go stale or come back, and while
+        they hold a value every HELD_AGE_INTERVAL seconds of its age.
+        """
+        now = time.monotonic()
+        stale = {
+            entity_id
+            for entity_id in self._failing
+            if now - self._good_at.get(entity_id, -math.inf) > self._stale_after
+        }
+        flipped = stale ^ self._stale
+        self._stale = stale
+
+        held_due = {
+            entity_id
+            for entity_id in self._failing - stale
+            if now
+            - self._held_written.get(entity_id, self._good_at.get(entity_id, now))
+            >= HELD_AGE_INTERVAL
+        }
+        self._held_written.update(dict.fromkeys(held_due, now))
+        return flipped | held_due
+
+    def _hold_unread(self, due_tiers: frozenset[str], started: float) -> None:
+        """Hold the values of the due entities not read in a failed update.
+
+        The coordinator only notifies entities of the first of several failed
+        updates, so the entities are notified here when it won't.
+        """
+        self._failing.update(
+            entity_id
+            for tier in due_tiers
+            for entity_id in self._tier_entities[tier]
+            if self._good_at.get(entity_id, -math.inf) < started
+        )
+        self._changed_entities = self._update_held()
+        self._notify_all = False
+        if not self.last_update_success and self._changed_entities:
+            self.async_update_listeners()
 
-            if is_holding:
-                result = await self.controller.async_read_holding_registers(
-                    address - 40001, 1
-                )
-            else:
-                result = await self.controller.async_read_input_registers(
-                    address - 30001, 1
-                )
+    async def async_write_entity(self, entity_id: str, raw_value: int) -> None:
+        """Write the raw value of a holding register entity and apply the read back.
 
-            if result and not result.isError():
-                raw_value = result.registers[0]
-                value = self._process_raw_value(raw_value, definition)
-                read_success = True
-
-        if read_success:
-            if self.data is None:
-                self.data = {}
-            self.data[entity_id] = value
-            self.async_update_listeners()
-        else:
-            _LOGGER.debug("Failed to refresh entity %s", entity_id)
+        The write goes through the controller's write queue, so writes in quick
+        succession are debounced and merged. Raises HomeAssistantError if the
+        write or its read back failed.
+        """
+        definition = self._entity_definitions[entity_id]
+        read_back = await self.controller.async_queue_write(
+            definition["register"] - 40001, raw_value
+        )
+
+        if read_back is None:
+            raise HomeAssistantError(f"Failed to write {entity_id}")
+
+        self._set_entity_value(
+            entity_id, self._process_raw_value(read_back, definition)
+        )
+
+    def _set_entity_value(self, entity_id: str, value: Any) -> None:
+        """Set the value of a single entity and notify it."""
+        if self.data is None:
+            self.data = {}
+        self.data[entity_id] = value
+        self._mark_read((entity_id,))
+        self._changed_entities = {entity_id}
+        self._notify_all = False
+        self.async_update_listeners()
 
     async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from the device and process it."""
+        """Fetch data from the device and process it.
+
+        Entities that could not be read keep their last good value, see
+        _hold_unread.
+        """
+        started = time.monotonic()
+        due_tiers = self._due_tiers()
         if not await self.controller.async_check_connection():
+            self._hold_unread(due_tiers, started)
+            circuit = self.controller.circuit
+            if circuit.state == CIRCUIT_OPEN:
+                raise UpdateFailed(
+                    f"Modbus device not answering, retrying in {circuit.retry_in:.0f} s"
+                )
             raise UpdateFailed("Could not connect to Modbus device")
 
         if self.translations is None:
@@ -206,86 +513,246 @@ class FroelingDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 self.hass, self.hass.config.language, "entity"
             )
 
-        data = {}
+        telemetry = self.controller.telemetry
+        telemetry.start_cycle(started)
+        data = dict(self.data or {})
+        block_traces: list[tuple[str, int, int, float, str]] = []
+        trace = {
+            "started": time.time(),
+            "tiers": sorted(due_tiers),
+            "duration": None,
+            "blocks": block_traces,
+        }
+        self.traces.append(trace)
 
+        retry_budget = self._retry_budget
         try:
-            for block_type, start_addr, count, entities_in_block in self._read_blocks:
-                read_success = False
-
-                if block_type == "discrete_input":
-                    result = await self.controller.async_read_discrete_inputs(
-                        start_addr - 10001, count
-                    )
-                elif block_type == "input":
-                    result = await self.controller.async_read_input_registers(
-                        start_addr - 30001, count
-                    )
-                elif block_type == "holding":
-                    result = await self.controller.async_read_holding_registers(
-                        start_addr - 40001, count
-                    )
-                elif block_type == "coil":
-                    result = await self.controller.async_read_coils(start_addr, count)
-
+            blocks = self._blocks_for_tiers(due_tiers)
+            results = await self._async_read_blocks(
+                [block for block, _table in blocks], block_traces
+            )
+            for (block, table), result in zip(blocks, results):
+                block_type, start_addr, count, entities_in_block = block
                 if result and not result.isError():
-                    read_success = True
-
-                if not read_success:
-                    _LOGGER.debug(
-                        "Failed to read %s block at address %s", block_type, start_addr
+                    decode_block(
+                        result.bits if block_type in BIT_TYPES else result.registers,
+                        table,
+                        data,
                     )
-                    for entity_id in entities_in_block:
-                        data[entity_id] = None
+                    self._mark_read(entities_in_block)
                     continue
 
+                _LOGGER.debug(
+                    "Failed to read %s block at address %s", block_type, start_addr
+                )
+                telemetry.failed_blocks += 1
+                self._failing.update(entities_in_block)
                 for entity_id in entities_in_block:
-                    definition = self._entity_definitions[entity_id]
-                    
-                    reg_addr = definition.get("register", definition.get("coil", definition.get("discrete_input")))
-                    offset = reg_addr - start_addr
-
-                    if block_type == "discrete_input":
-                        if offset < len(result.bits):
-                            data[entity_id] = result.bits[offset]
-                        else:
-                            data[entity_id] = None
-                        continue
-
-                    if block_type == "coil":
-                        if offset < len(result.bits):
-                            data[entity_id] = result.bits[offset]
-                        else:
-                            data[entity_id] = None
-                        continue
-
-                    if offset < len(result.registers):
-                        raw_value = result.registers[offset]
-                        processed_value = self._process_raw_value(raw_value, definition)
-                        data[entity_id] = processed_value
-                    else:
-                        data[entity_id] = None
-
-            for entity_id, definition in self._entity_definitions.items():
-                if definition.get("type") == "binary_sensor_from_register":
-                    source_register = definition["register"]
-                    source_value = None
-                    for other_id, other_def in self._entity_definitions.items():
-                        if (
-                            other_def.get("register") == source_register
-                            and other_id in data
-                        ):
-                            source_value = data[other_id]
-                            break
-                    if source_value is not None:
-                        data[entity_id] = source_value > 0
-                    else:
-                        data[entity_id] = None
+                    data.setdefault(entity_id, None)
+
+                if _is_illegal_address(result):
+                    await self._async_learn_holes(
+                        block_type, start_addr, count, entities_in_block, data
+                    )
+                else:
+                    retry_budget = await self._async_split_retry(
+                        block, data, block_traces, retry_budget
+                    )
 
         except Exception as e:
+            trace["duration"] = time.monotonic() - started
+            self._hold_unread(due_tiers, started)
             raise UpdateFailed(f"Error communicating with device: {e}") from e
 
+        telemetry.end_cycle(time.monotonic())
+        trace["duration"] = time.monotonic() - started
+        for tier in due_tiers:
+            if tier in self._tier_intervals:
+                self._next_poll[tier] = started + self._tier_intervals[tier]
+
+        if self._measure_cost_model:
+            self._update_cost_model()
+
+        previous = self.data or {}
+        # Entities holding their value only write their state now and then.
+        self._changed_entities = {
+            entity_id
+            for entity_id, value in data.items()
+            if entity_id not in previous or previous[entity_id] != value
+        } | self._update_held()
+        self._notify_all = self.data is None
+
         return data
 
+    async def _async_read_blocks(
+        self,
+        blocks: list[Block],
+        block_traces: list[tuple[str, int, int, float, str]],
+    ) -> list[Any]:
+        """Read blocks, as many at a time as the controller pipelines.
+
+        Results are returned in block order. If a read raises, the reads not
+        finished yet are cancelled and the exception is raised.
+        """
+        window = asyncio.Semaphore(self.controller.pipeline_depth)
+
+        async def read(block: Block) -> Any:
+            async with window:
+                return await self._async_read_traced(block, block_traces)
+
+        tasks = [asyncio.ensure_future(read(block)) for block in blocks]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    async def _async_read_traced(
+        self,
+        block: Block,
+        block_traces: list[tuple[str, int, int, float, str]],
+    ) -> Any:
+        """Read a block and add its outcome to the poll cycle trace."""
+        block_type, start_addr, count, _entities_in_block = block
+        block_started = time.monotonic()
+        try:
+            result = await self.controller.async_read_block(
+                block_type, start_addr, count
+            )
+            outcome = _describe_result(result)
+        except Exception as e:
+            outcome = repr(e)
+            raise
+        finally:
+            block_traces.append(
+                (
+                    block_type,
+                    start_addr,
+                    count,
+                    time.monotonic() - block_started,
+                    outcome,
+                )
+            )
+        return result
+
+    async def _async_split_retry(
+        self,
+        block: Block,
+        data: dict[str, Any],
+        block_traces: list[tuple[str, int, int, float, str]],
+        budget: int,
+    ) -> int:
+        """Read the entities of a failed block again in halves.
+
+        A single corrupted or lost answer shouldn't leave a whole block
+        unread until the next cycle. Each half that fails again is split
+        further, down to single entities, while budget requests are left and
+        the circuit is closed. Entities read are decoded into data, the others
+        keep their last good value. Returns the budget left.
+        """
+        telemetry = self.controller.telemetry
+        read_blocks, budget_left = await async_read_halves(
+            self.controller,
+            block,
+            self._group_registers,
+            lambda sub_block: self._async_read_traced(sub_block, block_traces),
+            budget,
+        )
+        telemetry.split_reads += budget - budget_left
+        for sub_block, result in read_blocks:
+            sub_type, _sub_start, _sub_count, sub_entities = sub_block
+            decode_block(
+                result.bits if sub_type in BIT_TYPES else result.registers,
+                self._compile_block(sub_block),
+                data,
+            )
+            self._mark_read(sub_entities)
+            telemetry.recovered_entities += len(sub_entities)
+        return budget_left
+
+    async def _async_learn_holes(
+        self,
+        block_type: str,
+        start_addr: int,
+        count: int,
+        entities_in_block: list[str],
+        data: dict[str, Any],
+    ) -> None:
+        """Find the addresses that made the device reject a block.
+
+        The block is bisected until every address the device rejects with an
+        illegal data address exception is isolated. The learned holes are
+        stored, the read plan is rebuilt around them and the entities of the
+        block are read again using the new plan.
+        """
+        holes: set[int] = set()
+        pending = [(start_addr, count)]
+        while pending:
+            probe_start, probe_count = pending.pop()
+            if probe_count == 1:
+                holes.add(probe_start)
+                continue
+
+            half = probe_count // 2
+            for sub_start, sub_count in (
+                (probe_start, half),
+                (probe_start + half, probe_count - half),
+            ):
+                result = await self.controller.async_read_block(
+                    block_type, sub_start, sub_count
+                )
+                if _is_illegal_address(result):
+                    pending.append((sub_start, sub_count))
+
+        if not holes:
+            return
+
+        _LOGGER.info(
+            "Device rejects %s addresses %s, excluding them from block reads",
+            block_type,
+            sorted(holes),
+        )
+        self._holes[block_type].update(holes)
+        self._store.async_delay_save(self._holes_to_store, HOLES_SAVE_DELAY)
+        self._replan()
+
+        block_definitions = {
+            entity_id: self._entity_definitions[entity_id]
+            for entity_id in entities_in_block
+        }
+        for sub_block in group_registers(
+            block_definitions,
+            self.request_overhead,
+            self.register_cost,
+            holes=self._holes,
+        ):
+            sub_type, sub_start, sub_count, sub_entities = sub_block
+            result = await self.controller.async_read_block(
+                sub_type, sub_start, sub_count
+            )
+            if result and not result.isError():
+                decode_block(
+                    result.bits if sub_type in BIT_TYPES else result.registers,
+                    self._compile_block(sub_block),
+                    data,
+                )
+                self._mark_read(sub_entities)
+
+    def _holes_to_store(self) -> dict[str, list[int]]:
+        """Return the learned holes in their stored form."""
+        return {
+            reg_type: sorted(addresses) for reg_type, addresses in self._holes.items()
+        }
+
+    async def _async_setup(self) -> None:
+        """Load the addresses the device is known to reject."""
+        if stored := await self._store.async_load():
+            for reg_type, addresses in stored.items():
+                if reg_type in self._holes:
+                    self._holes[reg_type].update(addresses)
+            self._replan()
+
     def _process_raw_value(self, raw_value: int, definition: dict[str, Any]) -> Any:
         """Process a raw register value into a scaled and typed sensor value."""
         entity_type = definition.get("type")
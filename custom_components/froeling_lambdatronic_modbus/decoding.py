@@ -0,0 +1,174 @@
+"""Precompiled decode tables for the read blocks of the Fröling integration."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable, Sequence
+from operator import itemgetter, truediv
+from typing import Any, NamedTuple
+
+from .block_planner import BIT_TYPES, Block
+
+# Below this many entries the setup of a bulk decode costs more than it saves.
+BULK_DECODE_MIN = 16
+
+
+class DecodeEntry(NamedTuple):
+    """How to decode the value of one entity from a read block."""
+
+    entity_id: str
+    offset: int
+    signed: bool
+    scale: float
+    decimals: int
+    decoder: Callable[[int], Any] | None
+
+
+class DecodeTable(NamedTuple):
+    """Decode table of a read block.
+
+    In blocks with at least BULK_DECODE_MIN of them, signed registers without
+    a decoder are decoded in bulk: picked from the block reinterpreted as
+    signed 16-bit values, divided by their scale and rounded to their decimals
+    in one pass. All other entries are decoded one by one.
+    """
+
+    entries: list[DecodeEntry]
+    bulk_ids: tuple[str, ...]
+    bulk_getter: Callable[[Sequence[int]], Any] | None
+    bulk_scales: tuple[float, ...]
+    bulk_ndigits: tuple[int | None, ...]
+    bulk_end: int
+    single: list[DecodeEntry]
+
+
+def _none(raw_value: int) -> None:
+    """Decode a register whose definition has a scaling of 0."""
+    return None
+
+
+def _positive(raw_value: int) -> bool:
+    """Decode a binary sensor derived from a signed register being above 0."""
+    return 0 < raw_value <= 32767
+
+
+def _identity(raw_value: Any) -> Any:
+    """Decode a value that is used as read."""
+    return raw_value
+
+
+def compile_block(
+    block: Block,
+    entity_definitions: dict[str, Any],
+    text_decoder: Callable[[str | None], Callable[[int], Any]],
+) -> DecodeTable:
+    """Compile the decode table of a read block.
+
+    Coils, discrete inputs, selects, texts and binary sensors derived from a
+    register get a decoder callable, all
+    other registers are decoded inline from the signedness, scale and
+    decimals of their entry. text_decoder returns the decoder of a text
+    entity from its translation key.
+    """
+    block_type, start_addr, _count, entities_in_block = block
+    table = []
+
+    for entity_id in entities_in_block:
+        definition = entity_definitions[entity_id]
+        reg_addr = definition.get(
+            "register", definition.get("coil", definition.get("discrete_input"))
+        )
+        offset = reg_addr - start_addr
+        entity_type = definition.get("type")
+        scaling = definition.get("scaling", 1)
+        decoder: Callable[[int], Any] | None = None
+
+        if block_type in BIT_TYPES or entity_type == "select":
+            decoder = _identity
+        elif entity_type == "binary_sensor_from_register":
+            decoder = _positive
+        elif entity_type == "text":
+            decoder = text_decoder(definition.get("translation_key"))
+        elif scaling == 0:
+            decoder = _none
+
+        table.append(
+            DecodeEntry(
+                entity_id,
+                offset,
+                definition.get("register_type", "input") in ("input", "holding"),
+                scaling or 1,
+                definition.get("decimals", 0),
+                decoder,
+            )
+        )
+
+    bulk = [entry for entry in table if entry.signed and entry.decoder is None]
+    if len(bulk) < BULK_DECODE_MIN:
+        bulk = []
+    bulk_getter = None
+    if bulk:
+        offsets = [entry.offset for entry in bulk]
+        # itemgetter returns a bare value instead of a tuple for one item.
+        bulk_getter = (
+            itemgetter(*offsets)
+            if len(offsets) > 1
+            else lambda values, offset=offsets[0]: (values[offset],)
+        )
+
+    return DecodeTable(
+        table,
+        tuple(entry.entity_id for entry in bulk),
+        bulk_getter,
+        tuple(entry.scale for entry in bulk),
+        # round() with ndigits None returns an int, like int(round(x)).
+        tuple(entry.decimals or None for entry in bulk),
+        max((entry.offset + 1 for entry in bulk), default=0),
+        [entry for entry in table if entry not in bulk],
+    )
+
+
+def to_signed(registers: Sequence[int]) -> array:
+    """Reinterpret unsigned 16-bit register values as signed."""
+    return array("h", array("H", registers).tobytes())
+
+
+def decode_block(
+    values: Sequence[Any], table: DecodeTable, data: dict[str, Any]
+) -> None:
+    """Decode the values of a read block into data using its decode table."""
+    size = len(values)
+    if table.bulk_getter is None:
+        entries = table.entries
+    elif table.bulk_end <= size:
+        data.update(
+            zip(
+                table.bulk_ids,
+                map(
+                    round,
+                    map(truediv, table.bulk_getter(to_signed(values)), table.bulk_scales),
+                    table.bulk_ndigits,
+                ),
+            )
+        )
+        entries = table.single
+    else:
+        entries = table.entries
+
+    for entity_id, offset, signed, scale, decimals, decoder in entries:
+        if offset >= size:
+            data[entity_id] = None
+            continue
+
+        raw_value = values[offset]
+        if decoder is not None:
+            data[entity_id] = decoder(raw_value)
+            continue
+
+        if signed and raw_value > 32767:
+            raw_value -= 65536
+
+        if decimals == 0:
+            data[entity_id] = int(round(raw_value / scale))
+        else:
+            data[entity_id] = round(raw_value / scale, decimals)
@@ -0,0 +1,116 @@
+"""Diagnostics support for the Fröling Lambdatronic Modbus integration."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import FroelingDataUpdateCoordinator
+
+TO_REDACT = {"host"}
+
+
+def _timestamp(seconds: float | None) -> str | None:
+    """Format a wall clock time as an ISO 8601 string."""
+    if seconds is None:
+        return None
+    return datetime.fromtimestamp(seconds, UTC).isoformat()
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: FroelingDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][
+        "coordinator"
+    ]
+    controller = coordinator.controller
+
+    return {
+        "config": async_redact_data({**entry.data, **entry.options}, TO_REDACT),
+        "block_plan": [
+            {
+                "type": block_type,
+                "start": start_addr,
+                "count": count,
+                "entities": entities_in_block,
+            }
+            for block_type, start_addr, count, entities_in_block in (
+                coordinator._read_blocks
+            )
+        ],
+        "estimated_bus_time": coordinator.estimated_bus_time,
+        "holes": {
+            block_type: sorted(addresses)
+            for block_type, addresses in coordinator._holes.items()
+        },
+        "traces": [
+            {
+                "started": _timestamp(trace["started"]),
+                "tiers": trace["tiers"],
+                "duration": trace["duration"],
+                "blocks": [
+                    {
+                        "type": block_type,
+                        "start": start_addr,
+                        "count": count,
+                        "duration": duration,
+                        "result": outcome,
+                    }
+                    for block_type, start_addr, count, duration, outcome in trace[
+                        "blocks"
+                    ]
+                ],
+            }
+            for trace in coordinator.traces
+        ],
+        "timeouts": [
+            {
+                "function_code": function_code,
+                "min_count": 1 << (size_class - 1),
+                "samples": estimator.samples,
+                "srtt": estimator.srtt,
+                "rttvar": estimator.rttvar,
+                "timeout": estimator.timeout,
+            }
+            for (function_code, size_class), estimator in sorted(
+                controller.rtt_estimators.items()
+            )
+        ],
+        "circuit": {
+            "state": controller.circuit.state,
+            "consecutive_failures": controller.circuit.failures,
+            "backoff": controller.circuit.backoff,
+        },
+        "snapshot": {
+            entity_id: {
+                "value": value,
+                "read_at": _timestamp(coordinator.read_at.get(entity_id)),
+                "age": coordinator.value_age(entity_id),
+                "available": coordinator.entity_available(entity_id),
+            }
+            for entity_id, value in (coordinator.data or {}).items()
+        },
+        "state_writes": {
+            "written": coordinator.state_writes,
+            "suppressed": coordinator.suppressed_writes,
+        },
+        "pipeline": {
+            "depth": controller.pipeline_depth,
+            "fallback": getattr(controller._client, "fallback", None),
+        },
+        "frame_gap": {
+            "gap": controller._connection.frame_gap,
+            "minimum": controller._connection.gap_tuner.minimum,
+            "auto_tune": controller._connection.gap_tuner.auto_tune,
+            "widened": controller._connection.gap_tuner.widened,
+            "narrowed": controller._connection.gap_tuner.narrowed,
+        },
+        "queue_wait": controller.queue_wait,
+        "telemetry": controller.telemetry.as_dict(),
+    }
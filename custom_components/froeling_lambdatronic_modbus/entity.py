@@ -0,0 +1,74 @@
+"""Base entities for the Fröling Lambdatronic Modbus integration."""
+
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import FroelingDataUpdateCoordinator
+
+
+class FroelingDeviceEntity(CoordinatorEntity[FroelingDataUpdateCoordinator]):
+    """An entity of the boiler device of a config entry."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self, coordinator: FroelingDataUpdateCoordinator, config: dict[str, Any]
+    ):
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self._device_name = config["name"]
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device info."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._device_name)},
+            name=self._device_name,
+            manufacturer="Froeling",
+            model="Lambdatronic Modbus",
+            sw_version="1.0",
+        )
+
+
+class FroelingEntity(FroelingDeviceEntity):
+    """An entity whose value is read from one entry of ENTITY_DEFINITIONS."""
+
+    # Differs on almost every state write, so keep it out of the recorder.
+    _unrecorded_attributes = frozenset({"value_age"})
+
+    def __init__(
+        self,
+        coordinator: FroelingDataUpdateCoordinator,
+        config: dict[str, Any],
+        entity_id: str,
+    ):
+        """Initialize the entity."""
+        super().__init__(coordinator, config)
+        self._entity_id = entity_id
+        self.entity_definition = coordinator._entity_definitions[entity_id]
+
+        self._attr_unique_id = f"{self._device_name}_{self._entity_id}"
+        self._attr_translation_key = self._entity_id
+
+    @property
+    def available(self) -> bool:
+        """Stay available while the last good value is not stale."""
+        return self.coordinator.entity_available(self._entity_id)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the age of the value in seconds when the state was written."""
+        age = self.coordinator.value_age(self._entity_id)
+        if age is None:
+            return None
+        return {"value_age": round(age)}
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the value of this entity changed."""
+        if self.coordinator.entity_changed(self._entity_id):
+            self.async_write_ha_state()
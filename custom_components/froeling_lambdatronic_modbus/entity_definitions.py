@@ -5,11 +5,13 @@ ENTITY_DEFINITIONS = {
         "anlagenzustand": {
             "register": 34001,
             "type": "text",
+            "tier": "fast",
             "translation_key": "anlagenzustand",
         },
         "kesselzustand": {
             "register": 34002,
             "type": "text",
+            "tier": "fast",
             "translation_key": "kesselzustand",
         },
         "aussentemperatur": {
@@ -25,18 +27,21 @@ ENTITY_DEFINITIONS = {
             "unit": "h",
             "scaling": 1,
             "type": "sensor",
+            "tier": "slow",
         },
         "stunden_im_heizen": {
             "register": 30064,
             "unit": "h",
             "scaling": 1,
             "type": "sensor",
+            "tier": "slow",
         },
         "stunden_im_scheitholzbetrieb": {
             "register": 30077,
             "unit": "h",
             "scaling": 1,
             "type": "sensor",
+            "tier": "slow",
         },
         "tuerkontakt": {
             "discrete_input": 10001,
@@ -64,6 +69,7 @@ ENTITY_DEFINITIONS = {
             "device_class": "temperature",
             "state_class": "measurement",
             "type": "sensor",
+            "tier": "fast",
         },
         "abgastemperatur": {
             "register": 30002,
@@ -72,6 +78,7 @@ ENTITY_DEFINITIONS = {
             "device_class": "temperature",
             "state_class": "measurement",
             "type": "sensor",
+            "tier": "fast",
         },
         "boardtemperatur": {
             "register": 30003,
@@ -86,6 +93,7 @@ ENTITY_DEFINITIONS = {
             "unit": "h",
             "scaling": 1,
             "type": "sensor",
+            "tier": "slow",
         },
         "saugzug_ansteuerung": {
             "register": 30014,
@@ -112,6 +120,7 @@ ENTITY_DEFINITIONS = {
             "scaling": 10,
             "decimals": 1,
             "type": "sensor",
+            "tier": "fast",
         },
         "ruecklauffuehler": {
             "register": 30010,
@@ -138,18 +147,21 @@ ENTITY_DEFINITIONS = {
             "unit": "h",
             "scaling": 1,
             "type": "sensor",
+            "tier": "slow",
         },
         "stunden_seit_letzter_wartung": {
             "register": 30056,
             "unit": "h",
             "scaling": 1,
             "type": "sensor",
+            "tier": "slow",
         },
         "betriebsstunden_in_der_feuererhaltung": {
             "register": 30025,
             "unit": "h",
             "scaling": 1,
             "type": "sensor",
+            "tier": "slow",
         },
         "kessel_solltemperatur": {
             "register": 40001,
@@ -174,6 +186,7 @@ ENTITY_DEFINITIONS = {
         f"kessel_fehlerpuffer_{i + 1}": {
             "register": 33001 + i,
             "type": "text",
+            "tier": "slow",
             "translation_key": "kessel_fehler",
         }
         for i in range(20)
@@ -858,6 +871,7 @@ ENTITY_DEFINITIONS = {
             "scaling": 1,
             "device_class": "weight",
             "type": "sensor",
+            "tier": "slow",
         },
         "resetierbarer_t_zaehler": {
             "register": 30083,
@@ -865,6 +879,7 @@ ENTITY_DEFINITIONS = {
             "scaling": 1,
             "device_class": "weight",
             "type": "sensor",
+            "tier": "slow",
         },
         "pelletverbrauch_gesamt": {
             "register": 30084,
@@ -874,6 +889,7 @@ ENTITY_DEFINITIONS = {
             "device_class": "weight",
             "state_class": "total",
             "type": "sensor",
+            "tier": "slow",
         },
         "pelletlager_restbestand": {
             "register": 40320,
@@ -1138,6 +1154,7 @@ ENTITY_DEFINITIONS = {
             "unit": "h",
             "scaling": 1,
             "type": "sensor",
+            "tier": "slow",
         },
         "minimaltemperatur_zweitkessel": {
             "register": 40507,
@@ -1220,6 +1237,7 @@ ENTITY_DEFINITIONS = {
             "unit": "h",
             "scaling": 1,
             "type": "sensor",
+            "tier": "slow",
         },
         "aktuelle_leistung_des_solar_wmz": {
             "register": 32611,
@@ -1264,6 +1282,7 @@ ENTITY_DEFINITIONS = {
             "device_class": "energy",
             "state_class": "total",
             "type": "sensor",
+            "tier": "slow",
         },
         "maximale_puffertemperatur_unten_bei_solarladung": {
             "register": 42603,
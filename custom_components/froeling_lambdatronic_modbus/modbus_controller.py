@@ -1,19 +1,611 @@
-"""Modbus Controller (async) using AsyncModbusTcpClient."""
+"""Modbus Controller (async) using the pymodbus TCP or serial client."""
 
 from __future__ import annotations
 
 import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
 import contextlib
+import heapq
+import itertools
 import logging
+import random
+import time
 from typing import Any
 
-from pymodbus.client import AsyncModbusTcpClient
+from pymodbus import FramerType
+from pymodbus.client import AsyncModbusSerialClient, AsyncModbusTcpClient
 from pymodbus.exceptions import ConnectionException, ModbusIOException
+from pymodbus.pdu import ModbusPDU
 
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import DOMAIN, FRAME_GAP_PRESETS
+from .pipeline import PipelinedTcpClient
+from .recorder import BusRecorder
+from .telemetry import BusTelemetry
 
 _LOGGER = logging.getLogger(__name__)
 
+ILLEGAL_FUNCTION = 0x01
+
+# Register type read by each read function code, for the timing samples.
+READ_BLOCK_TYPES = {1: "coil", 2: "discrete_input", 3: "holding", 4: "input"}
+
+# Bus request priorities, lowest value first: user writes, interactive reads
+# (entity refreshes, config flow previews) and background poll blocks.
+PRIORITY_WRITE = 0
+PRIORITY_INTERACTIVE = 1
+PRIORITY_POLL = 2
+PRIORITY_NAMES = {
+    PRIORITY_WRITE: "write",
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_POLL: "poll",
+}
+
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+# Consecutive failed requests or connects that open the circuit.
+CIRCUIT_FAILURE_THRESHOLD = 3
+# Bounds in seconds of the exponential backoff while the circuit is open.
+CIRCUIT_BACKOFF_MIN = 2.0
+CIRCUIT_BACKOFF_MAX = 120.0
+
+# Queued writes are flushed at the latest this many write delays after the
+# first of them, so a steady stream of writes can't postpone them forever.
+WRITE_DELAY_MAX_FACTOR = 4
+
+# Seconds an answer may stall on a serial line once it started arriving. Well
+# above 1.5 character times, as USB serial adapters deliver bytes in chunks.
+DEFAULT_INTER_CHAR_TIMEOUT = 0.05
+
+# Auto tuning of the frame gap: timeouts among the last FRAME_GAP_WINDOW
+# requests that count as a cluster, clean requests in a row before the gap is
+# narrowed, and the step and ceiling of the gap in seconds.
+FRAME_GAP_ERROR_CLUSTER = 2
+FRAME_GAP_WINDOW = 20
+FRAME_GAP_CLEAN_RUN = 100
+FRAME_GAP_STEP = 0.005
+FRAME_GAP_MAX = 0.2
+
+
+def rtu_frame_gap(baudrate: int) -> float:
+    """Return the silent interval in seconds required between RTU frames.
+
+    3.5 character times of 11 bits, fixed at 1.75 ms above 19200 baud as the
+    Modbus serial line specification recommends.
+    """
+    if baudrate > 19200:
+        return 0.00175
+    return 3.5 * 11 / baudrate
+
+
+def reply_matches(
+    function_code: int,
+    address: int,
+    count: int,
+    values: list[int] | None,
+    reply: ModbusPDU,
+) -> bool:
+    """Return True if an answer fits the request it was received for.
+
+    RTU answers carry no transaction id, so a late answer to an earlier
+    request can arrive in place of the expected one. It is recognised by its
+    function code, its register count or byte count (read coils and discrete
+    inputs answer whole bytes of bits) or the address and values echoed by a
+    write.
+    """
+    if reply.function_code & 0x7F != function_code:
+        return False
+    if reply.isError():
+        return True
+    if function_code in (1, 2):
+        return len(reply.bits) == (count + 7) // 8 * 8
+    if function_code in (3, 4, 23):
+        return len(reply.registers) == count
+    if function_code == 6:
+        return reply.address == address and reply.registers == values
+    if function_code == 16:
+        return reply.address == address and reply.count == count
+    return True
+
+
+class CircuitBreaker:
+    """Circuit breaker guarding a bridge that stopped answering.
+
+    Closed: requests pass, consecutive failures are counted. Open: requests
+    fail fast until the backoff expired. Half-open: requests pass again as
+    trials; the first success closes the circuit, the first failure opens it
+    again with the backoff doubled. Backoffs are jittered to between half and
+    all of their nominal length.
+    """
+
+    def __init__(self) -> None:
+        """Init."""
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.backoff = 0.0
+        self._retry_at = 0.0
+
+    def allow_request(self) -> bool:
+        """Return whether a request may be sent now."""
+        if self.state == CIRCUIT_OPEN:
+            if time.monotonic() < self._retry_at:
+                return False
+            self.state = CIRCUIT_HALF_OPEN
+            _LOGGER.debug("Circuit half-open, sending trial request")
+        return True
+
+    def record_success(self) -> None:
+        """Close the circuit after an answered request."""
+        if self.state != CIRCUIT_CLOSED:
+            _LOGGER.info("Modbus device answers again, circuit closed")
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.backoff = 0.0
+
+    def record_failure(self) -> None:
+        """Count a failed request and open the circuit if needed."""
+        self.failures += 1
+        if (
+            self.state == CIRCUIT_CLOSED
+            and self.failures < CIRCUIT_FAILURE_THRESHOLD
+        ):
+            return
+
+        self.trips += 1
+        self.backoff = min(
+            CIRCUIT_BACKOFF_MIN * 2 ** (self.trips - 1), CIRCUIT_BACKOFF_MAX
+        ) * random.uniform(0.5, 1.0)
+        self._retry_at = time.monotonic() + self.backoff
+        if self.state == CIRCUIT_CLOSED:
+            _LOGGER.warning(
+                "Modbus device not answering, pausing requests for %.0f s",
+                self.backoff,
+            )
+        self.state = CIRCUIT_OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until the next trial request while open."""
+        if self.state != CIRCUIT_OPEN:
+            return 0.0
+        return max(self._retry_at - time.monotonic(), 0.0)
+
+
+class RttEstimator:
+    """Round-trip time estimate and timeout of one kind of request.
+
+    Smoothed round-trip time and its mean deviation as in RFC 6298: the
+    timeout is the smoothed round-trip time plus four deviations, clamped to
+    [floor, ceiling]. Until the first sample the timeout is the ceiling.
+    """
+
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+
+    def __init__(self, floor: float, ceiling: float) -> None:
+        """Init."""
+        self.floor = floor
+        self.ceiling = ceiling
+        self.srtt: float | None = None
+        self.rttvar = 0.0
+        self.samples = 0
+
+    def add_sample(self, rtt: float) -> None:
+        """Update the estimate with a measured round-trip time."""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar += self.BETA * (abs(self.srtt - rtt) - self.rttvar)
+            self.srtt += self.ALPHA * (rtt - self.srtt)
+        self.samples += 1
+
+    @property
+    def timeout(self) -> float:
+        """Return the timeout of the next request."""
+        if self.srtt is None:
+            return self.ceiling
+        return min(max(self.srtt + 4 * self.rttvar, self.floor), self.ceiling)
+
+
+class FrameGapTuner:
+    """Minimum silent interval between frames, optionally tuned to the link.
+
+    The gap never drops below minimum. With auto tuning, a cluster of
+    timeouts widens it by doubling (by at least one step, up to
+    FRAME_GAP_MAX), as bridges whose serial buffer overruns lose frames sent
+    back to back; every run of clean requests narrows it by one step again.
+    """
+
+    def __init__(self, minimum: float, auto_tune: bool) -> None:
+        """Init."""
+        self.minimum = minimum
+        self.auto_tune = auto_tune
+        self.gap = minimum
+        self.widened = 0
+        self.narrowed = 0
+        self._timeouts: deque[bool] = deque(maxlen=FRAME_GAP_WINDOW)
+        self._clean_run = 0
+
+    def record(self, timed_out: bool) -> None:
+        """Record whether a request timed out and tune the gap."""
+        if not self.auto_tune:
+            return
+        self._timeouts.append(timed_out)
+
+        if not timed_out:
+            self._clean_run += 1
+            if self._clean_run >= FRAME_GAP_CLEAN_RUN and self.gap > self.minimum:
+                self.gap = max(self.gap - FRAME_GAP_STEP, self.minimum)
+                self.narrowed += 1
+                self._clean_run = 0
+                _LOGGER.debug("Narrowed the frame gap to %.3f s", self.gap)
+            return
+
+        self._clean_run = 0
+        if sum(self._timeouts) >= FRAME_GAP_ERROR_CLUSTER and self.gap < FRAME_GAP_MAX:
+            self.gap = min(max(self.gap * 2, self.gap + FRAME_GAP_STEP), FRAME_GAP_MAX)
+            self.widened += 1
+            self._timeouts.clear()
+            _LOGGER.debug("Widened the frame gap to %.3f s", self.gap)
+
+
+class PriorityLock:
+    """Lock granted to waiters by priority, in arrival order within a priority.
+
+    Up to slots holders share the lock. slots may be lowered while held; the
+    lock is then only handed on once the holders dropped below it.
+    """
+
+    def __init__(self, slots: int = 1) -> None:
+        """Init."""
+        self.slots = slots
+        self._holders = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+
+    def locked(self) -> bool:
+        """Return True if all slots are held."""
+        return self._holders >= self.slots
+
+    @contextlib.asynccontextmanager
+    async def acquire(self, priority: int) -> AsyncIterator[None]:
+        """Hold the lock, waiting behind holders and higher priority waiters."""
+        if self.locked():
+            future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+            try:
+                await future
+            except asyncio.CancelledError:
+                # Pass the lock on if it was handed over just before the cancel.
+                if future.done() and not future.cancelled():
+                    self._release()
+                raise
+        else:
+            self._holders += 1
+
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        """Hand the slot to the next waiter or free it."""
+        if self._holders <= self.slots:
+            while self._waiters:
+                _priority, _sequence, future = heapq.heappop(self._waiters)
+                if not future.done():
+                    future.set_result(None)
+                    return
+        self._holders -= 1
+
+
+class ConnectionSettingsMismatch(HomeAssistantError):
+    """The shared connection to a bridge is open with other settings."""
+
+
+class ModbusConnection:
+    """Modbus connection shared by all controllers using one bridge or port.
+
+    Many serial bridges accept a single TCP client only, so all config entries
+    and device ids behind one (host, port) share a client. Requests queue on
+    one priority lock and one circuit breaker. Timeouts and retries are
+    handled per request by the controllers, the client only gives up after
+    the ceiling timeout.
+
+    With the RTU framer (transparent bridges passing RTU frames through
+    unchanged) the serial silent interval between frames is kept by the
+    client, as the bridge doesn't delimit frames. Answers can't be matched
+    to requests by transaction id there: every answer received is kept, an
+    answer that doesn't fit its request is skipped for the next one (see
+    async_next_reply), and after a timeout the late answer is waited for and
+    discarded before the next request is sent (see
+    async_discard_late_replies). The serial transport talks
+    RTU to a local serial port (host is its path, port is unused) and keeps
+    the silent interval too. There, once an answer started arriving, a
+    request times out when no byte arrived for the inter-character timeout,
+    instead of waiting out the full timeout for a frame that broke off.
+
+    With a pipeline depth above 1 (Modbus TCP framing only) up to that many
+    requests are sent without waiting for the answers in between, see
+    PipelinedTcpClient. A request queued behind others in the bridge gets
+    its timeout multiplied by its position in the pipeline.
+
+    min_frame_gap keeps a silent interval after every answer or timeout
+    before the next request, for bridges that overrun when requests arrive
+    back to back; frame_gap_auto_tune tunes it, see FrameGapTuner.
+
+    All users of a connection have to use the same settings, as they share
+    one client; see acquire.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        timeout: float,
+        reconnect_delay: float,
+        framer: str = "socket",
+        baudrate: int = 9600,
+        transport: str = "tcp",
+        parity: str = "N",
+        inter_char_timeout: float = DEFAULT_INTER_CHAR_TIMEOUT,
+        pipeline_depth: int = 1,
+        min_frame_gap: float = 0.0,
+        frame_gap_auto_tune: bool = False,
+    ):
+        """Init."""
+        self.lock = PriorityLock()
+        self.circuit = CircuitBreaker()
+        # Requests pipelined on a closed connection connect one at a time,
+        # as connecting again closes the connection just opened.
+        self.connect_lock = asyncio.Lock()
+        # Requests sent and not answered yet.
+        self.in_flight = 0
+        self.inter_char_timeout: float | None = None
+        self._deadline: asyncio.Timeout | None = None
+        # Deadline of the request before the inter-character timeout moved it.
+        self._deadline_at: float | None = None
+        self.rtu = False
+        # Answers received on an RTU connection since the last request was
+        # sent, and the future waiting for the next one.
+        self._replies: deque[ModbusPDU] = deque(maxlen=8)
+        self._reply_waiter: asyncio.Future[None] | None = None
+        # Until when a late answer to a timed out RTU request may arrive.
+        self._late_reply_until = 0.0
+        if transport == "serial":
+            framer = "rtu"
+            self.rtu = True
+            self.inter_char_timeout = inter_char_timeout
+            self.client = AsyncModbusSerialClient(
+                host,
+                framer=FramerType.RTU,
+                baudrate=baudrate,
+                parity=parity,
+                retries=0,
+                timeout=timeout,
+                reconnect_delay=reconnect_delay,
+                trace_packet=self._trace_packet,
+                trace_pdu=self._trace_pdu,
+            )
+        elif framer == "socket" and pipeline_depth > 1:
+            self.lock.slots = pipeline_depth
+            self.client = PipelinedTcpClient(
+                host, port, pipeline_depth, timeout, self._stop_pipelining
+            )
+        else:
+            self.rtu = framer == "rtu"
+            self.client = AsyncModbusTcpClient(
+                host,
+                port=port,
+                framer=FramerType(framer),
+                retries=0,
+                timeout=timeout,
+                reconnect_delay=reconnect_delay,
+                trace_pdu=self._trace_pdu if self.rtu else None,
+            )
+        self.gap_tuner = FrameGapTuner(
+            max(rtu_frame_gap(baudrate) if framer == "rtu" else 0.0, min_frame_gap),
+            frame_gap_auto_tune,
+        )
+        # When the last frame was sent or received, for the frame gap.
+        self.last_frame = 0.0
+        self.users = 0
+        # The settings it was opened with, see acquire.
+        self.settings: dict[str, Any] = {}
+
+    def _trace_packet(self, sending: bool, data: bytes) -> bytes:
+        """Move the deadline of the request up as bytes of its answer arrive."""
+        if not sending and self._deadline is not None:
+            self._deadline.reschedule(
+                asyncio.get_running_loop().time() + self.inter_char_timeout
+            )
+        return data
+
+    def _trace_pdu(self, sending: bool, pdu: ModbusPDU) -> ModbusPDU:
+        """Keep the answers received, including those pymodbus ignores."""
+        if not sending:
+            self._replies.append(pdu)
+            if self._reply_waiter is not None and not self._reply_waiter.done():
+                self._reply_waiter.set_result(None)
+        return pdu
+
+    async def _async_wait_reply(self) -> None:
+        """Wait until an answer is received."""
+        self._reply_waiter = asyncio.get_running_loop().create_future()
+        try:
+            await self._reply_waiter
+        finally:
+            self._reply_waiter = None
+
+    async def async_next_reply(self, reply: ModbusPDU) -> ModbusPDU:
+        """Return the answer received after reply, waiting for it if needed.
+
+        Used when reply didn't fit its request; runs within the deadline of
+        the request. The inter-character timeout moved the deadline up while
+        the late answer arrived, so it is restored for the expected one.
+        """
+        while self._replies and self._replies.popleft() is not reply:
+            pass
+        if self._deadline is not None and self._deadline_at is not None:
+            self._deadline.reschedule(self._deadline_at)
+        while not self._replies:
+            await self._async_wait_reply()
+        return self._replies.popleft()
+
+    def expect_late_reply(self, sent: float, timeout: float) -> None:
+        """Note that a timed out request sent at sent may still be answered.
+
+        timeout is the timeout of the retry, twice the one that expired.
+        """
+        if self.rtu:
+            self._late_reply_until = sent + timeout
+
+    async def async_discard_late_replies(self) -> None:
+        """Drop the answers received since the last request before a new one.
+
+        After a timeout on an RTU connection, wait for the late answer until
+        the timeout of the retry has passed since the timed out request was
+        sent, so it isn't taken for the answer to the next request. That keeps
+        the wait in step with the learned timeout instead of the ceiling. An
+        answer later still is skipped by reply_matches unless it has the same
+        shape as the next one; answers then lag one request behind until the
+        bus is idle and the stray answer is dropped here.
+        """
+        wait = self._late_reply_until - time.monotonic()
+        if wait > 0 and not self._replies:
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(wait):
+                    await self._async_wait_reply()
+        if self._replies:
+            self.last_frame = time.monotonic()
+        self._late_reply_until = 0.0
+        self._replies.clear()
+
+    @property
+    def frame_gap(self) -> float:
+        """Return the silent interval kept between frames."""
+        return self.gap_tuner.gap
+
+    def _stop_pipelining(self) -> None:
+        """Send one request at a time after the bridge mishandled a pipeline."""
+        self.lock.slots = 1
+
+    @property
+    def pipeline_depth(self) -> int:
+        """Return the number of requests currently allowed in flight."""
+        return self.lock.slots
+
+    @contextlib.asynccontextmanager
+    async def async_deadline(self, timeout: float) -> AsyncIterator[int]:
+        """Time out a request and yield its position in the pipeline.
+
+        See the inter-character timeout and the pipeline depth above.
+        """
+        self.in_flight += 1
+        position = self.in_flight
+        try:
+            async with asyncio.timeout(timeout * position) as deadline:
+                self._deadline = deadline
+                self._deadline_at = deadline.when()
+                try:
+                    yield position
+                finally:
+                    self._deadline = None
+                    self._deadline_at = None
+        except TimeoutError:
+            if self.in_flight > 1 and isinstance(self.client, PipelinedTcpClient):
+                self.client.fall_back(
+                    "a request timed out while others were outstanding"
+                )
+            raise
+        finally:
+            self.in_flight -= 1
+
+    async def async_wait_frame_gap(self) -> None:
+        """Wait until the silent interval after the last frame has passed."""
+        if self.frame_gap:
+            wait = self.last_frame + self.frame_gap - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+    @staticmethod
+    def acquire(
+        hass: HomeAssistant,
+        host: str,
+        port: int,
+        timeout: float,
+        reconnect_delay: float,
+        framer: str = "socket",
+        baudrate: int = 9600,
+        transport: str = "tcp",
+        parity: str = "N",
+        inter_char_timeout: float = DEFAULT_INTER_CHAR_TIMEOUT,
+        pipeline_depth: int = 1,
+        min_frame_gap: float = 0.0,
+        frame_gap_auto_tune: bool = False,
+    ) -> ModbusConnection:
+        """Return the shared connection to a bridge, creating it if needed.
+
+        Raises ConnectionSettingsMismatch if the connection is already open
+        with other settings, as they can't be changed while it is in use.
+        """
+        connections: dict[tuple[str, int], ModbusConnection] = hass.data.setdefault(
+            DOMAIN, {}
+        ).setdefault("connections", {})
+
+        settings: dict[str, Any] = {
+            "timeout": timeout,
+            "reconnect_delay": reconnect_delay,
+            "framer": framer,
+            "baudrate": baudrate,
+            "transport": transport,
+            "parity": parity,
+            "inter_char_timeout": inter_char_timeout,
+            "pipeline_depth": pipeline_depth,
+            "min_frame_gap": min_frame_gap,
+            "frame_gap_auto_tune": frame_gap_auto_tune,
+        }
+        connection = connections.get((host, port))
+        if connection is None:
+            connection = connections[(host, port)] = ModbusConnection(
+                host, port, **settings
+            )
+            connection.settings = settings
+        elif connection.settings != settings:
+            differing = ", ".join(
+                f"{name} {connection.settings[name]} instead of {value}"
+                for name, value in settings.items()
+                if connection.settings[name] != value
+            )
+            raise ConnectionSettingsMismatch(
+                f"Connection to {host}:{port} is already in use with other "
+                f"settings: {differing}"
+            )
+        connection.users += 1
+        return connection
+
+    async def async_release(self, hass: HomeAssistant, host: str, port: int) -> None:
+        """Release the connection and close it when its last user is gone."""
+        self.users -= 1
+        if self.users > 0:
+            return
+
+        connections = hass.data.get(DOMAIN, {}).get("connections", {})
+        if connections.get((host, port)) is self:
+            del connections[(host, port)]
+
+        async with self.lock.acquire(PRIORITY_POLL):
+            with contextlib.suppress(Exception):
+                self.client.close()
+
 
 class ModbusController:
     """Async Modbus Controller to handle communication with the Fröling boiler."""
@@ -24,43 +616,270 @@ class ModbusController:
         host: str,
         port: int,
         device_id: int = 2,
-        timeout: int = 10,
+        timeout: float = 10,
+        timeout_floor: float = 0.3,
         retries: int = 1,
         reconnect_delay: float = 30,
+        write_delay: float = 0.5,
+        write_mode: str = "write_read",
+        recorder: BusRecorder | None = None,
+        framer: str = "socket",
+        baudrate: int = 9600,
+        transport: str = "tcp",
+        parity: str = "N",
+        inter_char_timeout: float = DEFAULT_INTER_CHAR_TIMEOUT,
+        pipeline_depth: int = 1,
+        frame_gap_preset: str = "none",
+        min_frame_gap: float = 0.0,
+        frame_gap_auto_tune: bool = False,
     ):
-        """Init."""
+        """Init. With the serial transport host is the path of the serial port.
+
+        frame_gap_preset selects the minimum frame gap of a known bridge from
+        FRAME_GAP_PRESETS; with "custom" min_frame_gap is used.
+        """
 
         self.hass = hass
         self.host = host
         self.port = port
         self.device_id = device_id
         self.timeout = timeout
+        self.timeout_floor = min(timeout_floor, timeout)
         self.retries = retries
         self.reconnect_delay = reconnect_delay
+        self.write_delay = write_delay
+        self.write_mode = write_mode
+        self.recorder = recorder
+        self.framer = framer
+        self.baudrate = baudrate
+        self.transport = transport
 
-        self._lock = asyncio.Lock()
-        self._client: AsyncModbusTcpClient = AsyncModbusTcpClient(
-            self.host,
-            port=self.port,
-            retries=self.retries,
-            timeout=self.timeout,
-            reconnect_delay=self.reconnect_delay,
+        self._connection = ModbusConnection.acquire(
+            hass,
+            host,
+            port,
+            timeout,
+            reconnect_delay,
+            framer,
+            baudrate,
+            transport,
+            parity,
+            inter_char_timeout,
+            pipeline_depth,
+            FRAME_GAP_PRESETS.get(frame_gap_preset, min_frame_gap),
+            frame_gap_auto_tune,
         )
+        self._lock = self._connection.lock
+        self.circuit = self._connection.circuit
+        self._client: (
+            AsyncModbusTcpClient | AsyncModbusSerialClient | PipelinedTcpClient
+        ) = self._connection.client
+        # (register type, count, seconds) of recent successful reads, only
+        # first attempts with nothing else in flight (see _async_request).
+        self.timing_samples: deque[tuple[str, int, float]] = deque(maxlen=64)
+        # Queued holding register writes: address -> (value, waiting futures).
+        self._pending_writes: dict[int, tuple[int, list[asyncio.Future]]] = {}
+        self._write_timer: asyncio.TimerHandle | None = None
+        # Loop time by which the queued writes are flushed at the latest.
+        self._write_deadline = 0.0
+        # Time requests spent waiting for the bus, per priority class.
+        self.queue_wait: dict[str, dict[str, float]] = {
+            name: {"requests": 0, "total": 0.0, "max": 0.0}
+            for name in PRIORITY_NAMES.values()
+        }
+        self.telemetry = BusTelemetry()
+        # Round-trip estimates per (function code, block size class).
+        self.rtt_estimators: dict[tuple[int, int], RttEstimator] = {}
+        # Whether the device answers read/write multiple registers (FC23),
+        # None until it answered or rejected the function code.
+        self._fc23_supported: bool | None = None
+        # Whether the device takes write multiple registers (FC16), False once
+        # it answered illegal function.
+        self._fc16_supported = True
 
-    async def async_check_connection(self) -> bool:
+    async def async_check_connection(self, priority: int = PRIORITY_POLL) -> bool:
         """Check if the client can connect."""
-        async with self._lock:
+        async with self._bus(priority):
             return await self._ensure_client_connected()
 
+    @property
+    def pipeline_depth(self) -> int:
+        """Return the number of requests currently allowed in flight."""
+        return self._connection.pipeline_depth
+
+    @contextlib.asynccontextmanager
+    async def _bus(self, priority: int) -> AsyncIterator[None]:
+        """Hold the shared bus for one request and record the queue wait."""
+        requested = time.monotonic()
+        async with self._lock.acquire(priority):
+            wait = time.monotonic() - requested
+            stats = self.queue_wait[PRIORITY_NAMES[priority]]
+            stats["requests"] += 1
+            stats["total"] += wait
+            stats["max"] = max(stats["max"], wait)
+            yield
+
+    async def _async_request(
+        self,
+        function_code: int,
+        device_id: int,
+        address: int,
+        count: int,
+        request: Callable[[], Awaitable[Any]],
+        values: list[int] | None = None,
+    ) -> Any:
+        """Send a request with a timeout learned from earlier round trips.
+
+        Requests are told apart by function code and by block size class
+        (count.bit_length(), so 1, 2-3, 4-7, ... elements). After a timeout the
+        request is retried with the timeout doubled, up to the ceiling. Only
+        answers to first attempts update the estimate, as a retried answer
+        can't be matched to its attempt (Karn's algorithm), and only if nothing
+        else was in flight, as a pipelined answer includes the wait behind the
+        requests ahead of it. The same answers of reads are kept as timing
+        samples for the cost model. The outcome is
+        reported to the circuit breaker, the telemetry and the recorder, if
+        any; exception responses count as answers.
+        """
+        key = (function_code, count.bit_length())
+        estimator = self.rtt_estimators.get(key)
+        if estimator is None:
+            estimator = self.rtt_estimators[key] = RttEstimator(
+                self.timeout_floor, self.timeout
+            )
+
+        timeout = estimator.timeout
+        first_started = time.monotonic()
+        for attempt in range(self.retries + 1):
+            await self._connection.async_discard_late_replies()
+            await self._connection.async_wait_frame_gap()
+            started = time.monotonic()
+            try:
+                async with self._connection.async_deadline(timeout) as position:
+                    result = await request()
+                    while self._connection.rtu and not reply_matches(
+                        function_code, address, count, values, result
+                    ):
+                        _LOGGER.debug(
+                            "Skipping late answer with function code %s "
+                            "to function code %s at %s",
+                            result.function_code,
+                            function_code,
+                            address,
+                        )
+                        result = await self._connection.async_next_reply(result)
+            except (ModbusIOException, ConnectionException):
+                self._connection.last_frame = time.monotonic()
+                self.telemetry.record_busy(time.monotonic() - started)
+                self.telemetry.record_request(
+                    function_code, count, 0.0, attempt, timed_out=True
+                )
+                if self.recorder is not None:
+                    self.recorder.record(
+                        function_code,
+                        device_id,
+                        address,
+                        count,
+                        values,
+                        None,
+                        first_started,
+                        time.monotonic() - started,
+                        attempt + 1,
+                    )
+                self.circuit.record_failure()
+                raise
+            except TimeoutError:
+                self._connection.last_frame = time.monotonic()
+                self.telemetry.record_busy(time.monotonic() - started)
+                _LOGGER.debug(
+                    "No response to function code %s within %.2f s",
+                    function_code,
+                    timeout,
+                )
+                self._connection.gap_tuner.record(True)
+                timeout = min(timeout * 2, self.timeout)
+                self._connection.expect_late_reply(started, timeout)
+                continue
+            self._connection.last_frame = time.monotonic()
+            if not reply_matches(function_code, address, count, values, result):
+                # Answers are matched by transaction id here, so this is a
+                # broken answer rather than a late one; ask again.
+                self.telemetry.record_busy(time.monotonic() - started)
+                _LOGGER.debug(
+                    "Discarding answer with function code %s to function code %s",
+                    result.function_code,
+                    function_code,
+                )
+                continue
+            latency = time.monotonic() - started
+            self.telemetry.record_busy(latency)
+            self.telemetry.record_request(
+                function_code,
+                count,
+                latency,
+                attempt,
+                exception_code=getattr(result, "exception_code", None)
+                if result is not None and result.isError()
+                else None,
+            )
+            if attempt == 0 and position == 1:
+                estimator.add_sample(latency)
+                if function_code in READ_BLOCK_TYPES and not result.isError():
+                    self.timing_samples.append(
+                        (READ_BLOCK_TYPES[function_code], count, latency)
+                    )
+            self._connection.gap_tuner.record(False)
+            if self.recorder is not None:
+                self.recorder.record(
+                    function_code,
+                    device_id,
+                    address,
+                    count,
+                    values,
+                    result,
+                    first_started,
+                    latency,
+                    attempt + 1,
+                )
+            self.circuit.record_success()
+            return result
+
+        self.telemetry.record_request(
+            function_code, count, 0.0, self.retries, timed_out=True
+        )
+        if self.recorder is not None:
+            self.recorder.record(
+                function_code,
+                device_id,
+                address,
+                count,
+                values,
+                None,
+                first_started,
+                time.monotonic() - started,
+                self.retries + 1,
+            )
+        self.circuit.record_failure()
+        raise ModbusIOException(
+            f"No response to function code {function_code} "
+            f"after {self.retries + 1} attempts"
+        )
+
     async def _ensure_client_connected(self) -> bool:
-        """Ensure the async client is connected."""
+        """Ensure the async client is connected, failing fast if the circuit is open."""
+        if not self.circuit.allow_request():
+            return False
         if self._client.connected:
             return True
 
         try:
-            connected = await self._client.connect()
+            async with self._connection.connect_lock:
+                connected = (
+                    self._client.connected or await self._client.connect()
+                )
             if not connected:
                 _LOGGER.debug("Could not connect to Modbus device")
+                self.circuit.record_failure()
                 return False
         except (TimeoutError, ModbusIOException, ConnectionException, OSError) as exc:
             _LOGGER.debug(
@@ -69,19 +888,24 @@ class ModbusController:
                 self.port,
                 exc,
             )
+            self.circuit.record_failure()
             return False
 
         return True
 
     async def async_read_input_registers(
-        self, address: int, count: int = 1, device_id: int | None = None
+        self,
+        address: int,
+        count: int = 1,
+        device_id: int | None = None,
+        priority: int = PRIORITY_POLL,
     ) -> Any:
         """Read input registers (async)."""
 
         if device_id is None:
             device_id = self.device_id
 
-        async with self._lock:
+        async with self._bus(priority):
             if not await self._ensure_client_connected():
                 return None
             try:
@@ -91,22 +915,32 @@ class ModbusController:
                     count,
                     device_id,
                 )
-                return await self._client.read_input_registers(
-                    address=address, count=count, device_id=device_id
+                return await self._async_request(
+                    4,
+                    device_id,
+                    address,
+                    count,
+                    lambda: self._client.read_input_registers(
+                        address=address, count=count, device_id=device_id
+                    ),
                 )
             except (ModbusIOException, ConnectionException) as exc:
                 _LOGGER.debug("Exception reading input registers: %s", exc)
                 return None
 
     async def async_read_discrete_inputs(
-        self, address: int, count: int = 1, device_id: int | None = None
+        self,
+        address: int,
+        count: int = 1,
+        device_id: int | None = None,
+        priority: int = PRIORITY_POLL,
     ) -> Any:
         """Read discrete inputs (async)."""
 
         if device_id is None:
             device_id = self.device_id
 
-        async with self._lock:
+        async with self._bus(priority):
             if not await self._ensure_client_connected():
                 return None
             try:
@@ -116,22 +950,32 @@ class ModbusController:
                     count,
                     device_id,
                 )
-                return await self._client.read_discrete_inputs(
-                    address=address, count=count, device_id=device_id
+                return await self._async_request(
+                    2,
+                    device_id,
+                    address,
+                    count,
+                    lambda: self._client.read_discrete_inputs(
+                        address=address, count=count, device_id=device_id
+                    ),
                 )
             except (ModbusIOException, ConnectionException) as exc:
                 _LOGGER.debug("Exception reading discrete inputs: %s", exc)
                 return None
 
     async def async_read_holding_registers(
-        self, address: int, count: int = 1, device_id: int | None = None
+        self,
+        address: int,
+        count: int = 1,
+        device_id: int | None = None,
+        priority: int = PRIORITY_POLL,
     ) -> Any:
         """Read holding registers (async)."""
 
         if device_id is None:
             device_id = self.device_id
 
-        async with self._lock:
+        async with self._bus(priority):
             if not await self._ensure_client_connected():
                 return None
             try:
@@ -141,22 +985,32 @@ class ModbusController:
                     count,
                     device_id,
                 )
-                return await self._client.read_holding_registers(
-                    address=address, count=count, device_id=device_id
+                return await self._async_request(
+                    3,
+                    device_id,
+                    address,
+                    count,
+                    lambda: self._client.read_holding_registers(
+                        address=address, count=count, device_id=device_id
+                    ),
                 )
             except (ModbusIOException, ConnectionException) as exc:
                 _LOGGER.debug("Exception reading holding registers: %s", exc)
                 return None
 
     async def async_read_coils(
-        self, address: int, count: int = 1, device_id: int | None = None
+        self,
+        address: int,
+        count: int = 1,
+        device_id: int | None = None,
+        priority: int = PRIORITY_POLL,
     ) -> Any:
         """Read coils (async)."""
 
         if device_id is None:
             device_id = self.device_id
 
-        async with self._lock:
+        async with self._bus(priority):
             if not await self._ensure_client_connected():
                 return None
             try:
@@ -166,13 +1020,43 @@ class ModbusController:
                     count,
                     device_id,
                 )
-                return await self._client.read_coils(
-                    address=address, count=count, device_id=device_id
+                return await self._async_request(
+                    1,
+                    device_id,
+                    address,
+                    count,
+                    lambda: self._client.read_coils(
+                        address=address, count=count, device_id=device_id
+                    ),
                 )
             except (ModbusIOException, ConnectionException) as exc:
                 _LOGGER.debug("Exception reading coils: %s", exc)
                 return None
 
+    async def async_read_block(
+        self,
+        block_type: str,
+        start_addr: int,
+        count: int,
+        priority: int = PRIORITY_POLL,
+    ) -> Any:
+        """Read a block of a register type starting at a Lambdatronic address."""
+        if block_type == "discrete_input":
+            return await self.async_read_discrete_inputs(
+                start_addr - 10001, count, priority=priority
+            )
+        if block_type == "input":
+            return await self.async_read_input_registers(
+                start_addr - 30001, count, priority=priority
+            )
+        if block_type == "holding":
+            return await self.async_read_holding_registers(
+                start_addr - 40001, count, priority=priority
+            )
+        if block_type == "coil":
+            return await self.async_read_coils(start_addr, count, priority=priority)
+        return None
+
     async def async_write_register(
         self, address: int, value: int, device_id: int | None = None
     ) -> bool:
@@ -181,7 +1065,7 @@ class ModbusController:
         if device_id is None:
             device_id = self.device_id
 
-        async with self._lock:
+        async with self._bus(PRIORITY_WRITE):
             if not await self._ensure_client_connected():
                 return False
             try:
@@ -191,17 +1075,250 @@ class ModbusController:
                     value,
                     device_id,
                 )
-                await self._client.write_register(address, value, device_id=device_id)
+                await self._async_request(
+                    6,
+                    device_id,
+                    address,
+                    1,
+                    lambda: self._client.write_register(
+                        address, value, device_id=device_id
+                    ),
+                    [value],
+                )
             except (ModbusIOException, ConnectionException) as exc:
                 _LOGGER.debug("Exception writing register: %s", exc)
                 return False
             else:
                 return True
 
+    async def async_write_registers(
+        self, address: int, values: list[int], device_id: int | None = None
+    ) -> bool:
+        """Write multiple consecutive registers (async)."""
+
+        if device_id is None:
+            device_id = self.device_id
+
+        async with self._bus(PRIORITY_WRITE):
+            if not await self._ensure_client_connected():
+                return False
+            try:
+                _LOGGER.debug(
+                    "async_write_registers address: %s, values: %s, device_id: %s",
+                    address,
+                    values,
+                    device_id,
+                )
+                result = await self._async_request(
+                    16,
+                    device_id,
+                    address,
+                    len(values),
+                    lambda: self._client.write_registers(
+                        address, values, device_id=device_id
+                    ),
+                    values,
+                )
+            except (ModbusIOException, ConnectionException) as exc:
+                _LOGGER.debug("Exception writing registers: %s", exc)
+                return False
+            else:
+                if getattr(result, "exception_code", None) == ILLEGAL_FUNCTION:
+                    _LOGGER.info(
+                        "Device does not support write multiple registers, "
+                        "writing registers one at a time"
+                    )
+                    self._fc16_supported = False
+                return not result.isError()
+
+    async def async_readwrite_registers(
+        self, address: int, values: list[int], device_id: int | None = None
+    ) -> Any:
+        """Write consecutive registers and read them back in one request (async)."""
+
+        if device_id is None:
+            device_id = self.device_id
+
+        async with self._bus(PRIORITY_WRITE):
+            if not await self._ensure_client_connected():
+                return None
+            try:
+                _LOGGER.debug(
+                    "async_readwrite_registers address: %s, values: %s, device_id: %s",
+                    address,
+                    values,
+                    device_id,
+                )
+                return await self._async_request(
+                    23,
+                    device_id,
+                    address,
+                    len(values),
+                    lambda: self._client.readwrite_registers(
+                        read_address=address,
+                        read_count=len(values),
+                        write_address=address,
+                        values=values,
+                        device_id=device_id,
+                    ),
+                    values,
+                )
+            except (ModbusIOException, ConnectionException) as exc:
+                _LOGGER.debug("Exception reading/writing registers: %s", exc)
+                return None
+
+    async def async_queue_write(self, address: int, value: int) -> int | None:
+        """Queue a holding register write and return the value read back.
+
+        Writes are debounced by write_delay, up to WRITE_DELAY_MAX_FACTOR
+        write delays after the first queued write: a later write to the same
+        register replaces the queued value, and when the queue is flushed
+        consecutive registers are written with a single write multiple
+        registers request and verified with one block read. Returns None if
+        the write or the read back failed.
+        """
+        future: asyncio.Future[int | None] = self.hass.loop.create_future()
+        _value, futures = self._pending_writes.get(address, (value, []))
+        futures.append(future)
+        self._pending_writes[address] = (value, futures)
+
+        now = self.hass.loop.time()
+        if self._write_timer is None:
+            self._write_deadline = now + self.write_delay * WRITE_DELAY_MAX_FACTOR
+        else:
+            self._write_timer.cancel()
+        self._write_timer = self.hass.loop.call_at(
+            min(now + self.write_delay, self._write_deadline),
+            self._schedule_flush_writes,
+        )
+        return await future
+
+    def _schedule_flush_writes(self) -> None:
+        """Flush the queued writes once the debounce delay expired."""
+        self._write_timer = None
+        self.hass.async_create_task(self._async_flush_writes())
+
+    async def _async_flush_writes(self) -> None:
+        """Write the queued registers and verify them with a read back."""
+        pending, self._pending_writes = self._pending_writes, {}
+        if not pending:
+            return
+
+        runs: list[tuple[int, list[int]]] = []
+        for address in sorted(pending):
+            value = pending[address][0]
+            if runs:
+                run_start, run_values = runs[-1]
+                if run_start + len(run_values) == address and len(run_values) < 123:
+                    run_values.append(value)
+                    continue
+            runs.append((address, [value]))
+
+        written: set[int] = set()
+        read_back: dict[int, int] = {}
+
+        if self.write_mode == "fc23":
+            remaining = []
+            for start, values in runs:
+                registers = None
+                if self._fc23_supported is not False:
+                    registers = await self._async_write_read_run(start, values)
+                if registers is None:
+                    remaining.append((start, values))
+                    continue
+                written.update(range(start, start + len(values)))
+                read_back.update(zip(range(start, start + len(values)), registers))
+            runs = remaining
+
+        needs_read_back = False
+        for start, values in runs:
+            if len(values) > 1 and self._fc16_supported:
+                if await self.async_write_registers(start, values):
+                    written.update(range(start, start + len(values)))
+                    needs_read_back = True
+                    continue
+                if self._fc16_supported:
+                    continue
+            # A single register, or FC16 was just turned off.
+            for address, value in zip(range(start, start + len(values)), values):
+                if await self.async_write_register(address, value):
+                    written.add(address)
+                    needs_read_back = True
+
+        if needs_read_back:
+            read_back.update(await self._async_read_back(runs))
+
+        for address, (_value, futures) in pending.items():
+            value = read_back.get(address) if address in written else None
+            for future in futures:
+                if not future.done():
+                    future.set_result(value)
+
+    async def _async_write_read_run(
+        self, start: int, values: list[int]
+    ) -> list[int] | None:
+        """Write a run of registers with FC23 and return the registers read back.
+
+        Returns None if the run has to be written and read back separately.
+        Only an illegal function answer turns FC23 off for good; after a
+        timeout or any other failure it is tried again with the next run.
+        """
+        result = await self.async_readwrite_registers(start, values)
+        if result is not None and not result.isError():
+            self._fc23_supported = True
+            return result.registers
+
+        if getattr(result, "exception_code", None) == ILLEGAL_FUNCTION:
+            _LOGGER.info(
+                "Device does not support read/write multiple registers, "
+                "writing and reading back separately"
+            )
+            self._fc23_supported = False
+        else:
+            _LOGGER.debug(
+                "Read/write multiple registers at %s failed, writing and "
+                "reading back separately",
+                start,
+            )
+        return None
+
+    async def _async_read_back(
+        self, runs: list[tuple[int, list[int]]]
+    ) -> dict[int, int]:
+        """Read back written holding registers, in one block if possible."""
+        first = runs[0][0]
+        count = runs[-1][0] + len(runs[-1][1]) - first
+        if count <= 125:
+            result = await self.async_read_holding_registers(
+                first, count, priority=PRIORITY_WRITE
+            )
+            if result and not result.isError():
+                return dict(zip(range(first, first + count), result.registers))
+            if len(runs) == 1:
+                return {}
+
+        # Too far apart, or the gaps between the runs are not readable.
+        read_back: dict[int, int] = {}
+        for start, values in runs:
+            result = await self.async_read_holding_registers(
+                start, len(values), priority=PRIORITY_WRITE
+            )
+            if result and not result.isError():
+                read_back.update(zip(range(start, start + len(values)), result.registers))
+        return read_back
+
     async def async_close(self) -> None:
         """Close async client connection."""
 
-        async with self._lock:
-            if self._client:
-                with contextlib.suppress(Exception):
-                    self._client.close()
+        if self._write_timer is not None:
+            self._write_timer.cancel()
+            self._write_timer = None
+        for _value, futures in self._pending_writes.values():
+            for future in futures:
+                if not future.done():
+                    future.set_result(None)
+        self._pending_writes = {}
+
+        if self.recorder is not None:
+            await self.recorder.async_close()
+        await self._connection.async_release(self.hass, self.host, self.port)
@@ -5,11 +5,10 @@ from typing import Any
 from decimal import Decimal, ROUND_HALF_UP
 from homeassistant.components.number import NumberEntity, NumberMode
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import FroelingDataUpdateCoordinator
+from .entity import FroelingEntity
 from .entity_definitions import ENTITY_DEFINITIONS
 
 _LOGGER = logging.getLogger(__name__)
@@ -35,7 +34,7 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
     async_add_entities(numbers)
 
 
-class FroelingNumber(CoordinatorEntity[FroelingDataUpdateCoordinator], NumberEntity):
+class FroelingNumber(FroelingEntity, NumberEntity):
     """A Fröling number entity that fetches data from the coordinator."""
 
     def __init__(
@@ -45,14 +44,7 @@ class FroelingNumber(CoordinatorEntity[FroelingDataUpdateCoordinator], NumberEnt
         entity_id: str,
     ):
         """Initialize the number entity."""
-        super().__init__(coordinator)
-        self._entity_id = entity_id
-        self._device_name = config["name"]
-        self.entity_definition = coordinator._entity_definitions[entity_id]
-
-        self._attr_unique_id = f"{self._device_name}_{self._entity_id}"
-        self._attr_has_entity_name = True
-        self._attr_translation_key = self._entity_id
+        super().__init__(coordinator, config, entity_id)
 
         self._attr_native_unit_of_measurement = self.entity_definition.get("unit")
         self._attr_native_min_value = self.entity_definition.get("min", 0)
@@ -89,18 +81,4 @@ class FroelingNumber(CoordinatorEntity[FroelingDataUpdateCoordinator], NumberEnt
             )
         )
 
-        await self.coordinator.controller.async_write_register(
-            register - 40001, scaled_value
-        )
-        await self.coordinator.async_refresh_entity(self._entity_id)
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return the device info."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._device_name)},
-            name=self._device_name,
-            manufacturer="Froeling",
-            model="Lambdatronic Modbus",
-            sw_version="1.0",
-        )
+        await self.coordinator.async_write_entity(self._entity_id, scaled_value)
@@ -0,0 +1,160 @@
+"""Pipelined Modbus TCP client for the Fröling Lambdatronic Modbus integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+
+from pymodbus.client.mixin import ModbusClientMixin
+from pymodbus.exceptions import ConnectionException, ModbusIOException
+from pymodbus.framer import FramerSocket
+from pymodbus.pdu import DecodePDU, ModbusPDU
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PipelinedTcpClient(ModbusClientMixin[Awaitable[ModbusPDU]]):
+    """Modbus TCP client with several transactions outstanding.
+
+    pymodbus' client waits for the answer to a request before sending the
+    next one. This client sends requests as they come and matches answers by
+    transaction id, so a bridge queueing requests can feed the serial line
+    back to back without waiting for a TCP round trip in between. Callers
+    limit the requests in flight to depth.
+
+    A bridge answers through one serial line, so answers arrive in request
+    order. When an answer overtakes an older outstanding request, or a request
+    times out while others were outstanding (see fall_back), the bridge
+    reordered or dropped queued requests: depth falls back to 1 for the
+    lifetime of the client, fallback holds the reason and on_fallback is
+    called.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        depth: int,
+        timeout: float,
+        on_fallback: Callable[[], None] | None = None,
+    ) -> None:
+        """Init. timeout applies to connecting."""
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.depth = depth
+        self.timeout = timeout
+        self.fallback: str | None = None
+        self._on_fallback = on_fallback
+        self._framer = FramerSocket(DecodePDU(is_server=False))
+        self._writer: asyncio.StreamWriter | None = None
+        self._receive_task: asyncio.Task[None] | None = None
+        # Futures of the outstanding requests by transaction id, in send order.
+        self._pending: dict[int, asyncio.Future[ModbusPDU]] = {}
+        self._transaction_id = 0
+
+    @property
+    def connected(self) -> bool:
+        """Return True if the connection is open."""
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self) -> bool:
+        """Open the connection; return False if the bridge can't be reached."""
+        self.close()
+        try:
+            async with asyncio.timeout(self.timeout):
+                reader, self._writer = await asyncio.open_connection(
+                    self.host, self.port
+                )
+        except (OSError, TimeoutError) as exc:
+            _LOGGER.debug("Could not connect to %s:%s: %s", self.host, self.port, exc)
+            return False
+        self._receive_task = asyncio.get_running_loop().create_task(
+            self._async_receive(reader)
+        )
+        return True
+
+    def close(self) -> None:
+        """Close the connection and fail the outstanding requests."""
+        if self._receive_task is not None:
+            self._receive_task.cancel()
+            self._receive_task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionException("Connection closed"))
+        self._pending.clear()
+
+    async def execute(
+        self, no_response_expected: bool, request: ModbusPDU
+    ) -> ModbusPDU:
+        """Send a request and wait for its answer.
+
+        There is no timeout here: callers wrap requests in their own, and
+        call fall_back if one timed out while others were outstanding. A
+        cancelled request alone says nothing about the bridge.
+        """
+        if self._writer is None or not self.connected:
+            raise ConnectionException(f"Not connected to {self.host}:{self.port}")
+
+        self._transaction_id = self._transaction_id % 0xFFFF + 1
+        request.transaction_id = self._transaction_id
+        future: asyncio.Future[ModbusPDU] = asyncio.get_running_loop().create_future()
+        self._pending[request.transaction_id] = future
+        self._writer.write(self._framer.buildFrame(request))
+        try:
+            return await future
+        finally:
+            self._pending.pop(request.transaction_id, None)
+
+    async def _async_receive(self, reader: asyncio.StreamReader) -> None:
+        """Match answers to outstanding requests until the connection closes."""
+        buffer = b""
+        try:
+            while data := await reader.read(1024):
+                buffer += data
+                while True:
+                    used, pdu = self._framer.handleFrame(buffer, 0, 0)
+                    buffer = buffer[used:]
+                    if pdu is None:
+                        break
+                    self._answer(pdu)
+        except (OSError, ModbusIOException) as exc:
+            _LOGGER.debug("Connection to %s:%s lost: %s", self.host, self.port, exc)
+        self._receive_task = None
+        self.close()
+
+    def _answer(self, pdu: ModbusPDU) -> None:
+        """Resolve the request an answer belongs to."""
+        future = self._pending.get(pdu.transaction_id)
+        if future is None:
+            _LOGGER.debug(
+                "Discarding late answer to transaction %s", pdu.transaction_id
+            )
+            return
+        if pdu.transaction_id != next(iter(self._pending)):
+            self.fall_back("an answer overtook an older request")
+        # Removed here and not when the waiting request resumes, as more
+        # answers may be handled before that.
+        del self._pending[pdu.transaction_id]
+        if not future.done():
+            future.set_result(pdu)
+
+    def fall_back(self, reason: str) -> None:
+        """Stop pipelining requests."""
+        if self.depth == 1:
+            return
+        _LOGGER.warning(
+            "Bridge %s:%s doesn't pipeline requests reliably (%s), "
+            "sending one request at a time",
+            self.host,
+            self.port,
+            reason,
+        )
+        self.depth = 1
+        self.fallback = reason
+        if self._on_fallback is not None:
+            self._on_fallback()
@@ -0,0 +1,129 @@
+"""Bus traffic recorder for the Fröling Lambdatronic Modbus integration."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime
+import json
+import logging
+import os
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# Recorded requests buffered before they are appended to the file.
+FLUSH_LINES = 50
+# Size of the recording at which it is moved to <path>.1 and started anew.
+MAX_BYTES = 10 * 1024 * 1024
+
+
+class BusRecorder:
+    """Append every request and its answer to a JSON lines file.
+
+    Every session, i.e. every setup of the config entry, starts with a header
+    line holding its wall clock start time ("session"). Then one line per
+    request: seconds since the session started ("t"), function
+    code, device id, protocol address, count, written values, the registers
+    or bits of the answer, the exception code of an exception response or
+    "error" if there was no answer, and the duration and number of attempts.
+    benchmarks/replay.py serves a recording back. Lines are written in
+    batches from the executor, so recording doesn't block the event loop.
+    When the file would grow beyond MAX_BYTES it is moved to <path>.1,
+    replacing an older one, and the session continues in a new file starting
+    with its header again.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        """Init."""
+        self.hass = hass
+        self.path = path
+        self._started = time.monotonic()
+        self._header = json.dumps(
+            {"session": datetime.now(UTC).isoformat(timespec="seconds")},
+            separators=(",", ":"),
+        )
+        # Bytes in the file, None until the first batch of the session.
+        self._size: int | None = None
+        self._lines: list[str] = []
+        self._flush: asyncio.Future[None] | None = None
+
+    def record(
+        self,
+        function_code: int,
+        device_id: int,
+        address: int,
+        count: int,
+        values: list[int] | None,
+        result: Any,
+        started: float,
+        duration: float,
+        attempts: int,
+    ) -> None:
+        """Record a request; result is None if it wasn't answered."""
+        entry: dict[str, Any] = {
+            "t": round(started - self._started, 4),
+            "fc": function_code,
+            "device_id": device_id,
+            "address": address,
+            "count": count,
+            "values": values,
+            "duration": round(duration, 4),
+            "attempts": attempts,
+        }
+        if result is None:
+            entry["error"] = "no response"
+        elif result.isError():
+            entry["exception"] = getattr(result, "exception_code", None)
+        elif function_code in (1, 2):
+            entry["response"] = [int(bit) for bit in result.bits[:count]]
+        elif function_code in (3, 4, 23):
+            entry["response"] = list(result.registers)
+
+        self._lines.append(json.dumps(entry, separators=(",", ":")))
+        if self._flush is None and len(self._lines) >= FLUSH_LINES:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        """Write the buffered lines in the executor."""
+        lines, self._lines = self._lines, []
+        self._flush = self.hass.async_add_executor_job(self._write, lines)
+        self._flush.add_done_callback(self._flushed)
+
+    def _flushed(self, future: asyncio.Future[None]) -> None:
+        """Continue with lines buffered while the last batch was written."""
+        self._flush = None
+        if future.exception() is not None:
+            _LOGGER.warning(
+                "Could not write bus recording %s: %s", self.path, future.exception()
+            )
+        if len(self._lines) >= FLUSH_LINES:
+            self._schedule_flush()
+
+    def _write(self, lines: list[str]) -> None:
+        """Append lines to the recording, starting a new file at MAX_BYTES."""
+        if self._size is None:
+            try:
+                self._size = os.path.getsize(self.path)
+            except FileNotFoundError:
+                self._size = 0
+            lines = [self._header, *lines]
+        data = "".join(f"{line}\n" for line in lines).encode()
+        if self._size and self._size + len(data) > MAX_BYTES:
+            os.replace(self.path, f"{self.path}.1")
+            self._size = 0
+            if lines[0] is not self._header:
+                data = f"{self._header}\n".encode() + data
+        with open(self.path, "ab") as file:
+            file.write(data)
+        self._size += len(data)
+
+    async def async_close(self) -> None:
+        """Write all buffered lines."""
+        if self._flush is not None:
+            await asyncio.wait([self._flush])
+        if self._lines:
+            lines, self._lines = self._lines, []
+            await self.hass.async_add_executor_job(self._write, lines)
@@ -1,20 +1,109 @@
 """Fröling Lambdatronic Modbus Sensor."""
 
+from collections.abc import Callable
 import logging
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import FroelingDataUpdateCoordinator
+from .entity import FroelingDeviceEntity, FroelingEntity
 from .entity_definitions import ENTITY_DEFINITIONS
+from .modbus_controller import CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN
+from .telemetry import BusTelemetry
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _round(value: float | None, ndigits: int) -> float | None:
+    """Round a telemetry value that may not be measured yet."""
+    return None if value is None else round(value, ndigits)
+
+
+# Bus telemetry sensors: unit, device class, state class, value and attributes.
+TELEMETRY_SENSORS: dict[str, dict[str, Any]] = {
+    "bus_requests": {
+        "state_class": SensorStateClass.TOTAL_INCREASING,
+        "value": lambda t: t.total("requests"),
+        "attributes": lambda t: {
+            f"fc{code}": stats.requests for code, stats in t.function_codes.items()
+        },
+    },
+    "bus_latency": {
+        "unit": UnitOfTime.MILLISECONDS,
+        "device_class": SensorDeviceClass.DURATION,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "value": lambda t: _round(
+            None if t.cycle_latency is None else t.cycle_latency * 1000, 1
+        ),
+        "attributes": lambda t: {
+            f"fc{code}_histogram": stats.as_dict()["latency_histogram"]
+            for code, stats in t.function_codes.items()
+        },
+    },
+    "bus_bytes": {
+        "unit": UnitOfInformation.BYTES,
+        "device_class": SensorDeviceClass.DATA_SIZE,
+        "state_class": SensorStateClass.TOTAL_INCREASING,
+        "value": lambda t: t.total("bytes_sent") + t.total("bytes_received"),
+        "attributes": lambda t: {
+            "sent": t.total("bytes_sent"),
+            "received": t.total("bytes_received"),
+        },
+    },
+    "bus_retries": {
+        "state_class": SensorStateClass.TOTAL_INCREASING,
+        "value": lambda t: t.total("retries"),
+        "attributes": lambda t: {"unanswered": t.total("timeouts")},
+    },
+    "bus_exceptions": {
+        "state_class": SensorStateClass.TOTAL_INCREASING,
+        "value": lambda t: sum(
+            sum(stats.exceptions.values()) for stats in t.function_codes.values()
+        ),
+        "attributes": lambda t: {
+            f"fc{code}": dict(stats.exceptions)
+            for code, stats in t.function_codes.items()
+            if stats.exceptions
+        },
+    },
+    "failed_blocks": {
+        "state_class": SensorStateClass.TOTAL_INCREASING,
+        "value": lambda t: t.failed_blocks,
+        "attributes": lambda t: {
+            "split_reads": t.split_reads,
+            "recovered_entities": t.recovered_entities,
+        },
+    },
+    "poll_cycle_duration": {
+        "unit": UnitOfTime.SECONDS,
+        "device_class": SensorDeviceClass.DURATION,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "value": lambda t: _round(t.cycle_duration, 2),
+        "attributes": lambda t: {"requests": t.cycle_requests},
+    },
+    "bus_utilization": {
+        "unit": PERCENTAGE,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "value": lambda t: _round(
+            None if t.bus_utilization is None else t.bus_utilization * 100, 1
+        ),
+    },
+}
+
+
 async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entities):
     """Set up the sensor platform."""
     entry = hass.data[DOMAIN][config_entry.entry_id]
@@ -32,10 +121,14 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
                     if definition.get("type") in ["sensor", "text"]:
                         sensors.append(FroelingSensor(coordinator, config, entity_id))
 
+    sensors.append(FroelingCircuitSensor(coordinator, config))
+    sensors.extend(
+        FroelingTelemetrySensor(coordinator, config, key) for key in TELEMETRY_SENSORS
+    )
     async_add_entities(sensors)
 
 
-class FroelingSensor(CoordinatorEntity[FroelingDataUpdateCoordinator], SensorEntity):
+class FroelingSensor(FroelingEntity, SensorEntity):
     """A Fröling sensor that fetches data from the coordinator."""
 
     def __init__(
@@ -45,14 +138,7 @@ class FroelingSensor(CoordinatorEntity[FroelingDataUpdateCoordinator], SensorEnt
         entity_id: str,
     ):
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._entity_id = entity_id
-        self._device_name = config["name"]
-        self.entity_definition = coordinator._entity_definitions[entity_id]
-
-        self._attr_unique_id = f"{self._device_name}_{self._entity_id}"
-        self._attr_has_entity_name = True
-        self._attr_translation_key = self._entity_id
+        super().__init__(coordinator, config, entity_id)
 
         self._attr_native_unit_of_measurement = self.entity_definition.get("unit")
         self._attr_device_class = self.entity_definition.get("device_class")
@@ -76,13 +162,81 @@ class FroelingSensor(CoordinatorEntity[FroelingDataUpdateCoordinator], SensorEnt
             return self.entity_definition.get("decimals", 0)
         return None
 
+
+class FroelingCircuitSensor(FroelingDeviceEntity, SensorEntity):
+    """Diagnostic sensor showing the circuit breaker state of the connection."""
+
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_options = [CIRCUIT_CLOSED, CIRCUIT_OPEN, CIRCUIT_HALF_OPEN]
+    _attr_translation_key = "circuit"
+
+    def __init__(
+        self, coordinator: FroelingDataUpdateCoordinator, config: dict[str, Any]
+    ):
+        """Initialize the sensor."""
+        super().__init__(coordinator, config)
+        self._attr_unique_id = f"{self._device_name}_circuit"
+
+    @property
+    def available(self) -> bool:
+        """Stay available while the device is not answering."""
+        return True
+
     @property
-    def device_info(self) -> DeviceInfo:
-        """Return the device info."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._device_name)},
-            name=self._device_name,
-            manufacturer="Froeling",
-            model="Lambdatronic Modbus",
-            sw_version="1.0",
+    def native_value(self) -> str:
+        """Return the circuit state."""
+        return self.coordinator.controller.circuit.state
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the failure count and current backoff."""
+        circuit = self.coordinator.controller.circuit
+        return {
+            "consecutive_failures": circuit.failures,
+            "backoff": round(circuit.backoff, 1),
+        }
+
+
+class FroelingTelemetrySensor(FroelingDeviceEntity, SensorEntity):
+    """Diagnostic sensor publishing a bus telemetry value, disabled by default."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: FroelingDataUpdateCoordinator,
+        config: dict[str, Any],
+        key: str,
+    ):
+        """Initialize the sensor."""
+        super().__init__(coordinator, config)
+        description = TELEMETRY_SENSORS[key]
+        self._value: Callable[[BusTelemetry], Any] = description["value"]
+        self._attributes: Callable[[BusTelemetry], dict[str, Any]] | None = (
+            description.get("attributes")
         )
+
+        self._attr_unique_id = f"{self._device_name}_{key}"
+        self._attr_translation_key = key
+        self._attr_native_unit_of_measurement = description.get("unit")
+        self._attr_device_class = description.get("device_class")
+        self._attr_state_class = description.get("state_class")
+
+    @property
+    def available(self) -> bool:
+        """Stay available while the device is not answering."""
+        return True
+
+    @property
+    def native_value(self) -> Any:
+        """Return the telemetry value."""
+        return self._value(self.coordinator.controller.telemetry)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the breakdown of the telemetry value."""
+        if self._attributes is None:
+            return None
+        return self._attributes(self.coordinator.controller.telemetry)
@@ -0,0 +1,189 @@
+"""Bus telemetry of the Fröling Lambdatronic Modbus integration."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+# Upper bounds in seconds of the request latency histogram buckets, the last
+# bucket counts everything slower.
+LATENCY_BUCKETS = (0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+
+# Bytes of an RTU frame around the PDU: device id and CRC.
+RTU_FRAME_OVERHEAD = 3
+
+
+def pdu_sizes(function_code: int, count: int) -> tuple[int, int]:
+    """Return the request and response PDU sizes in bytes of a request.
+
+    count is the number of coils or registers read or written.
+    """
+    if function_code in (1, 2):
+        return 5, 2 + (count + 7) // 8
+    if function_code in (3, 4):
+        return 5, 2 + 2 * count
+    if function_code == 6:
+        return 5, 5
+    if function_code == 16:
+        return 6 + 2 * count, 5
+    if function_code == 23:
+        return 10 + 2 * count, 2 + 2 * count
+    return 5, 5
+
+
+class FunctionCodeStats:
+    """Counters of the requests sent with one function code."""
+
+    def __init__(self) -> None:
+        """Init."""
+        self.requests = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.exceptions: dict[int, int] = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latency_total = 0.0
+        self.latency_histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters as a dict."""
+        answered = self.requests - self.timeouts
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "exceptions": dict(self.exceptions),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "mean_latency": self.latency_total / answered if answered else None,
+            "latency_histogram": dict(
+                zip(
+                    [f"<={bound}" for bound in LATENCY_BUCKETS] + ["slower"],
+                    self.latency_histogram,
+                )
+            ),
+        }
+
+
+class BusTelemetry:
+    """Request counters of a controller and timings of its poll cycles.
+
+    Bytes are counted as RTU frames on the serial side of the bridge, which is
+    the slow part of the bus. Busy time is the time spent waiting for answers.
+    """
+
+    def __init__(self) -> None:
+        """Init."""
+        self.function_codes: dict[int, FunctionCodeStats] = {}
+        self.busy_time = 0.0
+        self.failed_blocks = 0
+        self.split_reads = 0
+        self.recovered_entities = 0
+        self.cycle_duration: float | None = None
+        self.cycle_requests: int | None = None
+        self.cycle_latency: float | None = None
+        self.bus_utilization: float | None = None
+        self._cycle_start: tuple[float, float, int, int, float] | None = None
+        self._previous_cycle_start: tuple[float, float] | None = None
+
+    def record_request(
+        self,
+        function_code: int,
+        count: int,
+        latency: float,
+        retries: int,
+        exception_code: int | None = None,
+        timed_out: bool = False,
+    ) -> None:
+        """Record a request and its outcome.
+
+        latency is the time of the last attempt, retries the number of
+        attempts before it.
+        """
+        stats = self.function_codes.get(function_code)
+        if stats is None:
+            stats = self.function_codes[function_code] = FunctionCodeStats()
+
+        request_size, response_size = pdu_sizes(function_code, count)
+        if exception_code is not None:
+            response_size = 2
+            stats.exceptions[exception_code] = (
+                stats.exceptions.get(exception_code, 0) + 1
+            )
+
+        stats.requests += 1
+        stats.retries += retries
+        stats.bytes_sent += (retries + 1) * (request_size + RTU_FRAME_OVERHEAD)
+        if timed_out:
+            stats.timeouts += 1
+        else:
+            stats.bytes_received += response_size + RTU_FRAME_OVERHEAD
+            stats.latency_total += latency
+            stats.latency_histogram[bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def record_busy(self, seconds: float) -> None:
+        """Add time the bus was occupied by this controller."""
+        self.busy_time += seconds
+
+    def start_cycle(self, now: float) -> None:
+        """Mark the start of a poll cycle."""
+        self._cycle_start = (
+            now,
+            self.busy_time,
+            self.total("requests"),
+            self._answered(),
+            self.total("latency_total"),
+        )
+
+    def end_cycle(self, now: float) -> None:
+        """Record the duration of a poll cycle and the bus utilization.
+
+        Utilization is the busy time since the start of the previous cycle
+        divided by the time since then, so writes and refreshes between
+        cycles are included.
+        """
+        if self._cycle_start is None:
+            return
+        started, busy_at_start, requests, answered, latency = self._cycle_start
+        self._cycle_start = None
+        self.cycle_duration = now - started
+        self.cycle_requests = self.total("requests") - requests
+        answered = self._answered() - answered
+        self.cycle_latency = (
+            (self.total("latency_total") - latency) / answered if answered else None
+        )
+
+        if self._previous_cycle_start is not None:
+            previous_start, previous_busy = self._previous_cycle_start
+            if started > previous_start:
+                self.bus_utilization = (busy_at_start - previous_busy) / (
+                    started - previous_start
+                )
+        self._previous_cycle_start = (started, busy_at_start)
+
+    def total(self, counter: str) -> Any:
+        """Return the sum of a counter over all function codes."""
+        return sum(
+            getattr(stats, counter) for stats in self.function_codes.values()
+        )
+
+    def _answered(self) -> int:
+        """Return the number of answered requests."""
+        return self.total("requests") - self.total("timeouts")
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all telemetry as a dict."""
+        return {
+            "function_codes": {
+                function_code: stats.as_dict()
+                for function_code, stats in sorted(self.function_codes.items())
+            },
+            "busy_time": self.busy_time,
+            "failed_blocks": self.failed_blocks,
+            "split_reads": self.split_reads,
+            "recovered_entities": self.recovered_entities,
+            "cycle_duration": self.cycle_duration,
+            "cycle_requests": self.cycle_requests,
+            "cycle_latency": self.cycle_latency,
+            "bus_utilization": self.bus_utilization,
+        }